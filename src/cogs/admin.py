@@ -10,8 +10,6 @@ from config import (
     guild_settings,
     get_guild_settings,
     save_guild_configs,
-    get_voice_channel_ids,
-    get_private_voice_lobby_id,
     GEM_TRIGGER_PHRASE,
 )
 
@@ -219,9 +217,10 @@ class AdminCog(commands.Cog, name="Admin"):
         if ctx.guild is None:
             return
 
+        # Merged settings already include the primary guild's defaults
         settings = get_guild_settings(ctx.guild.id)
-        resolved_voice = get_voice_channel_ids(ctx.guild)
-        resolved_lobby = get_private_voice_lobby_id(ctx.guild)
+        resolved_voice = settings.voice_channel_ids or frozenset()
+        resolved_lobby = settings.private_voice_lobby_id
 
         embed = discord.Embed(
             title=f"Guild configuration for {ctx.guild.name}", color=0x1ABC9C
@@ -305,7 +304,7 @@ class AdminCog(commands.Cog, name="Admin"):
                 for token in value.split():
                     channel = await converter.convert(ctx, token)
                     channel_ids.add(channel.id)
-                settings.voice_channel_ids = channel_ids or None
+                settings.voice_channel_ids = frozenset(channel_ids) or None
                 await ctx.send(
                     "Voice monitor channels updated to: "
                     + (", ".join(f"<#{cid}>" for cid in channel_ids) if channel_ids else "None")
@@ -324,6 +323,7 @@ class AdminCog(commands.Cog, name="Admin"):
                 return
 
             save_guild_configs()
+            self.bot.dispatch("guild_config_update", ctx.guild.id)
         except commands.BadArgument as e:
             await ctx.send(f"I couldn't parse that value: {e}")
         except Exception as e:
@@ -368,6 +368,7 @@ class AdminCog(commands.Cog, name="Admin"):
             return
 
         save_guild_configs()
+        self.bot.dispatch("guild_config_update", ctx.guild.id)
         await ctx.send(f"Cleared custom value for {key}; now using defaults.")
 
 
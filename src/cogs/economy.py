@@ -1,5 +1,6 @@
 """ChronoNation Economy Cog - Player commands for the economy simulation."""
 
+import asyncio
 import random
 from datetime import datetime, timedelta
 from typing import Optional
@@ -7,9 +8,10 @@ from typing import Optional
 import discord
 from discord.ext import commands, tasks
 
-from db.economy import get_or_create_nation
+from db.economy import get_or_create_nation, maintenance_tick
 from economy_service import EconomyService
 from services.economy import process_year_tick
+from utils.govcache import invalidate
 
 
 CLASS_EMOJI = {
@@ -36,6 +38,7 @@ class EconomyCog(commands.Cog, name="Economy"):
         for guild in self.bot.guilds:
             try:
                 result = await process_year_tick(guild.id)
+                invalidate(guild.id)
                 
                 # Find a channel to post the summary
                 channel = discord.utils.get(guild.text_channels, name="nation-history")
@@ -73,6 +76,12 @@ class EconomyCog(commands.Cog, name="Economy"):
             except Exception as e:
                 print(f"Year tick failed for guild {guild.id}: {e}")
 
+        try:
+            # PRAGMA optimize and the WAL checkpoint block; keep them off the loop
+            await asyncio.to_thread(maintenance_tick)
+        except Exception as e:
+            print(f"Economy DB maintenance failed: {e}")
+
     @year_tick_loop.before_loop
     async def before_year_tick(self):
         await self.bot.wait_until_ready()
@@ -88,7 +97,10 @@ class EconomyCog(commands.Cog, name="Economy"):
         """View your economic profile or another player's."""
         target = member or ctx.author
         profile = self.service.get_profile(ctx.guild.id, target.id)
-        class_emoji = CLASS_EMOJI.get(profile.class_tier, "")
+        citizen, nation, class_tier = profile.citizen, profile.nation, profile.class_tier
+        bal, age, rep = citizen["balance"], citizen["age"], citizen["reputation"]
+        cur_sym, nation_name, year = nation["currency_symbol"], nation["name"], nation["current_year"]
+        class_emoji = CLASS_EMOJI.get(class_tier, "")
         job_name = profile.job["name"] if profile.job else "Unemployed"
 
         embed = discord.Embed(
@@ -99,21 +111,22 @@ class EconomyCog(commands.Cog, name="Economy"):
 
         embed.add_field(
             name="\U0001f4b0 Balance",
-            value=f"{profile.nation['currency_symbol']}{profile.citizen['balance']:,.2f}",
+            value=f"{cur_sym}{bal:,.2f}",
             inline=True,
         )
-        embed.add_field(name="\U0001f4c5 Age", value=f"{profile.citizen['age']} years", inline=True)
-        embed.add_field(name="\U0001f4ca Class", value=profile.class_tier.title(), inline=True)
+        embed.add_field(name="\U0001f4c5 Age", value=f"{age} years", inline=True)
+        embed.add_field(name="\U0001f4ca Class", value=class_tier.title(), inline=True)
         embed.add_field(name="\U0001f4bc Job", value=job_name, inline=True)
         embed.add_field(name="\U0001f5fd Party", value=profile.party_name, inline=True)
-        embed.add_field(name="\u2b50 Reputation", value=str(profile.citizen["reputation"]), inline=True)
+        embed.add_field(name="\u2b50 Reputation", value=str(rep), inline=True)
 
-        if profile.properties:
-            embed.add_field(name="\U0001f3e0 Properties", value=str(len(profile.properties)), inline=True)
-        if profile.businesses:
-            embed.add_field(name="\U0001f4b8 Businesses", value=str(len(profile.businesses)), inline=True)
+        properties, businesses = profile.properties, profile.businesses
+        if properties:
+            embed.add_field(name="\U0001f3e0 Properties", value=str(len(properties)), inline=True)
+        if businesses:
+            embed.add_field(name="\U0001f4b8 Businesses", value=str(len(businesses)), inline=True)
 
-        embed.set_footer(text=f"{profile.nation['name']} | Year {profile.nation['current_year']}")
+        embed.set_footer(text=f"{nation_name} | Year {year}")
         await ctx.send(embed=embed)
 
     @commands.hybrid_command(name="work", aliases=["w"])
@@ -121,15 +134,23 @@ class EconomyCog(commands.Cog, name="Economy"):
     async def work(self, ctx: commands.Context):
         """Work at your job to earn money and XP."""
         result = self.service.work(ctx.guild.id, ctx.author.id)
-        if not result.success:
-            await ctx.send(f"? {result.message}")
+        ok, msg, job, earn, xp, cur = (
+            result.success,
+            result.message,
+            result.job_name,
+            result.earnings,
+            result.xp_gain,
+            result.currency_symbol,
+        )
+        if not ok:
+            await ctx.send(f"? {msg}")
             return
 
         work_messages = [
-            f"You put in a solid day's work as a {result.job_name}.",
-            f"Another productive shift at your {result.job_name} job!",
+            f"You put in a solid day's work as a {job}.",
+            f"Another productive shift at your {job} job!",
             f"Hard work pays off! You earned your keep today.",
-            f"You hustled through your {result.job_name} duties.",
+            f"You hustled through your {job} duties.",
         ]
 
         embed = discord.Embed(
@@ -139,10 +160,10 @@ class EconomyCog(commands.Cog, name="Economy"):
         )
         embed.add_field(
             name="Earned",
-            value=f"{result.currency_symbol}{result.earnings:,.2f}",
+            value=f"{cur}{earn:,.2f}",
             inline=True,
         )
-        embed.add_field(name="XP Gained", value=f"+{result.xp_gain}", inline=True)
+        embed.add_field(name="XP Gained", value=f"+{xp}", inline=True)
 
         await ctx.send(embed=embed)
 
@@ -1,7 +1,6 @@
 """ChronoNation Government Cog - Laws, elections, and nation administration."""
 
-import json
-from datetime import datetime, timedelta
+import asyncio
 from typing import Optional
 
 import discord
@@ -10,11 +9,8 @@ from discord.ext import commands
 from db.economy import (
     get_or_create_nation,
     update_nation,
-    get_or_create_citizen,
-    get_all_policies,
     get_policy,
     set_policy,
-    get_offices,
     appoint_to_office,
     create_bill,
     vote_on_bill,
@@ -26,7 +22,50 @@ from db.economy import (
     DEFAULT_POLICIES,
 )
 from services.economy import process_year_tick, socialize_property
+from utils import chunks
+from utils.govcache import (
+    cached_nation,
+    cached_offices,
+    cached_holder_powers,
+    cached_offices_by_name,
+    cached_snapshot,
+    invalidate,
+)
+
+
+# Discord caps a message at 10 embeds and 6000 characters across them
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+FIELDS_PER_EMBED = 10
+
+_YES = frozenset({"yes", "y", "for"})
+_VOTE_OK = frozenset({"yes", "no", "y", "n", "for", "against"})
+_OPEN_PROPOSAL_GOVS = frozenset({"democracy", "presidential"})
+_NO_POWERS = frozenset()
+
+_POLICY_KEYS = frozenset(DEFAULT_POLICIES)
+_POLICY_TYPES = {k: type(v) for k, v in DEFAULT_POLICIES.items()}
+_TRUTHY = frozenset({"true", "yes", "1", "on"})
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in _TRUTHY
+
+
+_POLICY_PARSERS = {bool: _parse_bool, int: int, float: float, str: str}
+
 
+async def _send_embeds(ctx: commands.Context, embeds: list):
+    """Send embeds in as few messages as Discord's per-message limits allow."""
+    batch, size = [], 0
+    for embed in embeds:
+        if batch and (len(batch) >= MAX_EMBEDS or size + len(embed) > MAX_EMBED_CHARS):
+            await ctx.send(embeds=batch)
+            batch, size = [], 0
+        batch.append(embed)
+        size += len(embed)
+    if batch:
+        await ctx.send(embeds=batch)
 
 GOV_TYPES = {
     "democracy": "Parliamentary Democracy",
@@ -42,28 +81,29 @@ class GovernmentCog(commands.Cog, name="Government"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    def _resolve_name(self, guild: discord.Guild, user_id: int) -> str:
+        """Display name for a user, preferring the guild member cache."""
+        member = guild.get_member(user_id)
+        if member:
+            return member.display_name
+        user = self.bot.get_user(user_id)
+        return user.display_name if user else f"User {user_id}"
+
     def _is_in_government(self, guild_id: int, user_id: int) -> bool:
         """Check if user holds any government office."""
-        offices = get_offices(guild_id)
-        return any(o.get("holder_id") == user_id for o in offices)
+        return user_id in cached_holder_powers(guild_id)
 
     def _has_power(self, guild_id: int, user_id: int, power: str) -> bool:
         """Check if user has a specific government power."""
-        offices = get_offices(guild_id)
-        for office in offices:
-            if office.get("holder_id") == user_id:
-                powers = json.loads(office.get("powers", "[]"))
-                if "all" in powers or power in powers:
-                    return True
-        return False
+        powers = cached_holder_powers(guild_id).get(user_id, _NO_POWERS)
+        return "all" in powers or power in powers
 
     # ============ Nation Setup Commands ============
 
     @commands.hybrid_command(name="nation")
     async def nation_info(self, ctx: commands.Context):
         """View nation information."""
-        nation = get_or_create_nation(ctx.guild.id)
-        policies = get_all_policies(ctx.guild.id)
+        nation, policies, offices = cached_snapshot(ctx.guild.id)
         
         gov_type = GOV_TYPES.get(nation["gov_type"], nation["gov_type"])
         
@@ -109,12 +149,11 @@ class GovernmentCog(commands.Cog, name="Government"):
         )
         
         # Offices
-        offices = get_offices(ctx.guild.id)
         if offices:
             office_strs = []
             for o in offices[:5]:
-                holder = self.bot.get_user(o["holder_id"]) if o.get("holder_id") else None
-                holder_name = holder.display_name if holder else "Vacant"
+                holder_id = o.get("holder_id")
+                holder_name = self._resolve_name(ctx.guild, holder_id) if holder_id else "Vacant"
                 office_strs.append(f"**{o['name']}**: {holder_name}")
             embed.add_field(
                 name="Government Offices",
@@ -133,6 +172,7 @@ class GovernmentCog(commands.Cog, name="Government"):
         update_nation(ctx.guild.id, name=name)
         create_default_jobs(ctx.guild.id)
         create_default_offices(ctx.guild.id, nation["gov_type"])
+        invalidate(ctx.guild.id)
         
         log_history(ctx.guild.id, 1, "nation_founded", 
                    f"The nation of {name} was founded!")
@@ -176,6 +216,7 @@ class GovernmentCog(commands.Cog, name="Government"):
             create_default_offices(ctx.guild.id, value)
         
         update_nation(ctx.guild.id, **{key: value})
+        invalidate(ctx.guild.id)
         await ctx.send(f"✅ Set `{key}` to `{value}`")
 
     # ============ Policy & Law Commands ============
@@ -183,8 +224,7 @@ class GovernmentCog(commands.Cog, name="Government"):
     @commands.hybrid_command(name="policies")
     async def list_policies(self, ctx: commands.Context):
         """View all current policies."""
-        policies = get_all_policies(ctx.guild.id)
-        nation = get_or_create_nation(ctx.guild.id)
+        nation, policies, _ = cached_snapshot(ctx.guild.id)
         
         embed = discord.Embed(
             title=f"📜 {nation['name']} - Policies",
@@ -230,157 +270,145 @@ class GovernmentCog(commands.Cog, name="Government"):
     @commands.hybrid_command(name="law")
     async def law_cmd(self, ctx: commands.Context, action: str = "list", *, args: str = ""):
         """Manage laws. Actions: propose, list, vote, info"""
-        nation = get_or_create_nation(ctx.guild.id)
+        action = action.lower()
+        args = args.strip()
+        handler = _LAW_ACTIONS.get(action, GovernmentCog._law_unknown)
+        await handler(self, ctx, args)
+
+    async def _law_list(self, ctx: commands.Context, args: str):
+        bills = get_pending_bills(ctx.guild.id)
         
-        if action.lower() == "list":
-            bills = get_pending_bills(ctx.guild.id)
-            
-            if not bills:
-                await ctx.send("📭 No pending bills. Use `?law propose <policy> <value>` to propose one.")
-                return
-            
+        if not bills:
+            await ctx.send("📭 No pending bills. Use `?law propose <policy> <value>` to propose one.")
+            return
+        
+        embeds = []
+        for page in chunks(bills, FIELDS_PER_EMBED):
             embed = discord.Embed(
-                title="📋 Pending Bills",
+                title="📋 Pending Bills" if not embeds else None,
                 color=discord.Color.purple(),
             )
-            
-            for bill in bills[:10]:
-                proposer = self.bot.get_user(bill["proposer_id"])
-                proposer_name = proposer.display_name if proposer else f"User {bill['proposer_id']}"
-                
-                ends = datetime.fromisoformat(bill["voting_ends_at"])
-                time_left = ends - datetime.utcnow()
-                hours_left = max(0, time_left.total_seconds() / 3600)
+            for bill in page:
+                proposer_name = self._resolve_name(ctx.guild, bill["proposer_id"])
                 
                 embed.add_field(
                     name=f"Bill #{bill['id']}: {bill['policy_key']}",
                     value=f"New Value: `{bill['new_value']}`\n"
                           f"Proposed by: {proposer_name}\n"
                           f"Votes: {bill['votes_for']} for / {bill['votes_against']} against\n"
-                          f"Time left: {hours_left:.1f}h",
+                          f"Ends: <t:{bill['voting_ends_at']}:R>",
                     inline=False
                 )
-            
-            embed.set_footer(text="Vote with: ,law vote <bill_id> yes/no")
-            await ctx.send(embed=embed)
+            embeds.append(embed)
         
-        elif action.lower() == "propose":
-            # Check if user has propose power
-            if not self._has_power(ctx.guild.id, ctx.author.id, "propose_law"):
-                # In democracies, anyone can propose
-                policies = get_all_policies(ctx.guild.id)
-                if nation["gov_type"] not in ["democracy", "presidential"]:
-                    await ctx.send("❌ You don't have the power to propose laws!")
-                    return
-            
-            # Parse args: <policy_key> <new_value> [description]
-            parts = args.split(maxsplit=2)
-            if len(parts) < 2:
-                await ctx.send("❌ Usage: `?law propose <policy_key> <new_value> [description]`\n"
-                              "Example: `?law propose income_tax_rate 0.25 Increase income tax to 25%`")
-                return
-            
-            policy_key = parts[0]
-            new_value = parts[1]
-            description = parts[2] if len(parts) > 2 else f"Change {policy_key} to {new_value}"
-            
-            # Validate policy key
-            if policy_key not in DEFAULT_POLICIES:
-                await ctx.send(f"❌ Unknown policy key. Use `?policies` to see available policies.")
-                return
-            
-            bill_id = create_bill(
-                ctx.guild.id, ctx.author.id, policy_key, 
-                new_value, description, voting_hours=24
-            )
-            
-            log_history(ctx.guild.id, nation["current_year"], "bill_proposed",
-                       f"Bill #{bill_id} proposed: {policy_key} = {new_value}")
-            
-            await ctx.send(f"📜 **Bill #{bill_id}** proposed!\n"
-                          f"Policy: `{policy_key}` → `{new_value}`\n"
-                          f"Voting open for 24 hours. Use `?law vote {bill_id} yes/no`")
-        
-        elif action.lower() == "vote":
-            parts = args.split()
-            if len(parts) < 2:
-                await ctx.send("❌ Usage: `?law vote <bill_id> yes/no`")
-                return
-            
-            try:
-                bill_id = int(parts[0])
-            except ValueError:
-                await ctx.send("❌ Invalid bill ID.")
-                return
-            
-            vote_choice = parts[1].lower()
-            if vote_choice not in ["yes", "no", "y", "n", "for", "against"]:
-                await ctx.send("❌ Vote must be `yes` or `no`.")
-                return
-            
-            vote_for = vote_choice in ["yes", "y", "for"]
-            
-            # Check voting eligibility
-            policies = get_all_policies(ctx.guild.id)
-            eligibility = policies.get("voting_eligibility", "all")
-            citizen = get_or_create_citizen(ctx.guild.id, ctx.author.id)
-            
-            if eligibility == "elites_only" and citizen["balance"] < policies["elite_class_threshold"]:
-                await ctx.send("❌ Only elites can vote in this nation!")
-                return
-            
-            if vote_on_bill(bill_id, ctx.author.id, vote_for):
-                vote_str = "✅ for" if vote_for else "❌ against"
-                await ctx.send(f"🗳️ You voted {vote_str} Bill #{bill_id}")
-            else:
-                await ctx.send("❌ Could not vote. Bill may not exist or you already voted.")
-        
-        elif action.lower() == "info":
-            if not args:
-                await ctx.send("❌ Specify a policy key: `?law info income_tax_rate`")
-                return
-            
-            policy_key = args.strip()
-            if policy_key not in DEFAULT_POLICIES:
-                await ctx.send("❌ Unknown policy key.")
+        embeds[-1].set_footer(text="Vote with: ,law vote <bill_id> yes/no")
+        await _send_embeds(ctx, embeds)
+
+    async def _law_propose(self, ctx: commands.Context, args: str):
+        # Check if user has propose power
+        if not self._has_power(ctx.guild.id, ctx.author.id, "propose_law"):
+            # In democracies, anyone can propose
+            if cached_nation(ctx.guild.id)["gov_type"] not in _OPEN_PROPOSAL_GOVS:
+                await ctx.send("❌ You don't have the power to propose laws!")
                 return
-            
-            current = get_policy(ctx.guild.id, policy_key)
-            default = DEFAULT_POLICIES[policy_key]
-            
-            await ctx.send(f"📜 **{policy_key}**\n"
-                          f"Current: `{current}`\n"
-                          f"Default: `{default}`")
         
+        # Parse args: <policy_key> <new_value> [description]
+        parts = args.split(maxsplit=2)
+        if len(parts) < 2:
+            await ctx.send("❌ Usage: `?law propose <policy_key> <new_value> [description]`\n"
+                          "Example: `?law propose income_tax_rate 0.25 Increase income tax to 25%`")
+            return
+        
+        policy_key = parts[0]
+        new_value = parts[1]
+        description = parts[2] if len(parts) > 2 else f"Change {policy_key} to {new_value}"
+        
+        # Validate policy key
+        if policy_key not in _POLICY_KEYS:
+            await ctx.send(f"❌ Unknown policy key. Use `?policies` to see available policies.")
+            return
+        
+        nation = cached_nation(ctx.guild.id)
+        bill_id = create_bill(
+            ctx.guild.id, ctx.author.id, policy_key, 
+            new_value, description, voting_hours=24
+        )
+        
+        log_history(ctx.guild.id, nation["current_year"], "bill_proposed",
+                   f"Bill #{bill_id} proposed: {policy_key} = {new_value}")
+        
+        await ctx.send(f"📜 **Bill #{bill_id}** proposed!\n"
+                      f"Policy: `{policy_key}` → `{new_value}`\n"
+                      f"Voting open for 24 hours. Use `?law vote {bill_id} yes/no`")
+
+    async def _law_vote(self, ctx: commands.Context, args: str):
+        parts = args.split()
+        if len(parts) < 2:
+            await ctx.send("❌ Usage: `?law vote <bill_id> yes/no`")
+            return
+        
+        try:
+            bill_id = int(parts[0])
+        except ValueError:
+            await ctx.send("❌ Invalid bill ID.")
+            return
+        
+        vote_choice = parts[1].lower()
+        if vote_choice not in _VOTE_OK:
+            await ctx.send("❌ Vote must be `yes` or `no`.")
+            return
+        
+        vote_for = vote_choice in _YES
+        
+        success, reason = vote_on_bill(bill_id, ctx.author.id, vote_for)
+        if success:
+            vote_str = "✅ for" if vote_for else "❌ against"
+            await ctx.send(f"🗳️ You voted {vote_str} Bill #{bill_id}")
+        elif reason == "ineligible":
+            await ctx.send("❌ Only elites can vote in this nation!")
         else:
-            await ctx.send("❌ Unknown action. Use: `list`, `propose`, `vote`, `info`")
+            await ctx.send("❌ Could not vote. Bill may not exist or you already voted.")
+
+    async def _law_info(self, ctx: commands.Context, args: str):
+        if not args:
+            await ctx.send("❌ Specify a policy key: `?law info income_tax_rate`")
+            return
+        
+        policy_key = args
+        if policy_key not in _POLICY_KEYS:
+            await ctx.send("❌ Unknown policy key.")
+            return
+        
+        current = get_policy(ctx.guild.id, policy_key)
+        default = DEFAULT_POLICIES[policy_key]
+        
+        await ctx.send(f"📜 **{policy_key}**\n"
+                      f"Current: `{current}`\n"
+                      f"Default: `{default}`")
+
+    async def _law_unknown(self, ctx: commands.Context, args: str):
+        await ctx.send("❌ Unknown action. Use: `list`, `propose`, `vote`, `info`")
 
     @commands.hybrid_command(name="policy")
     @commands.has_permissions(administrator=True)
     async def set_policy_direct(self, ctx: commands.Context, key: str, *, value: str):
         """Directly set a policy (Admin only, bypasses voting)."""
-        if key not in DEFAULT_POLICIES:
+        if key not in _POLICY_KEYS:
             await ctx.send(f"❌ Unknown policy key. Use `?policies` to see valid keys.")
             return
         
         # Parse value type
-        default = DEFAULT_POLICIES[key]
+        parser = _POLICY_PARSERS.get(_POLICY_TYPES[key], str)
         try:
-            if isinstance(default, bool):
-                parsed = value.lower() in ["true", "yes", "1", "on"]
-            elif isinstance(default, int):
-                parsed = int(value)
-            elif isinstance(default, float):
-                parsed = float(value)
-            else:
-                parsed = value
+            parsed = parser(value)
         except ValueError:
             await ctx.send(f"❌ Invalid value type for `{key}`.")
             return
         
         set_policy(ctx.guild.id, key, parsed)
+        invalidate(ctx.guild.id, "policies")
         
-        nation = get_or_create_nation(ctx.guild.id)
+        nation = cached_nation(ctx.guild.id)
         log_history(ctx.guild.id, nation["current_year"], "policy_decree",
                    f"Policy decree: {key} set to {parsed}")
         
@@ -391,39 +419,41 @@ class GovernmentCog(commands.Cog, name="Government"):
     @commands.hybrid_command(name="offices")
     async def list_offices(self, ctx: commands.Context):
         """View government offices."""
-        offices = get_offices(ctx.guild.id)
-        nation = get_or_create_nation(ctx.guild.id)
+        nation, _, offices = cached_snapshot(ctx.guild.id)
         
         if not offices:
             create_default_offices(ctx.guild.id, nation["gov_type"])
-            offices = get_offices(ctx.guild.id)
+            invalidate(ctx.guild.id, "offices")
+            offices = cached_offices(ctx.guild.id)
         
-        embed = discord.Embed(
-            title=f"🏛️ {nation['name']} - Government Offices",
-            color=discord.Color.purple(),
-        )
-        
-        for office in offices:
-            holder = self.bot.get_user(office["holder_id"]) if office.get("holder_id") else None
-            holder_name = holder.display_name if holder else "**Vacant**"
-            
-            term_info = ""
-            if office.get("holder_id") and office.get("term_start_year"):
-                years_in = nation["current_year"] - office["term_start_year"]
-                term_info = f"\nIn office: {years_in}/{office['term_years']} years"
-            
-            powers = json.loads(office.get("powers", "[]"))
-            powers_str = ", ".join(powers[:3]) if powers else "None"
-            
-            embed.add_field(
-                name=office["name"],
-                value=f"Holder: {holder_name}{term_info}\n"
-                      f"Term: {office['term_years']} years\n"
-                      f"Powers: {powers_str}",
-                inline=True
+        embeds = []
+        for page in chunks(offices, FIELDS_PER_EMBED):
+            embed = discord.Embed(
+                title=f"🏛️ {nation['name']} - Government Offices" if not embeds else None,
+                color=discord.Color.purple(),
             )
+            for office in page:
+                holder_id = office.get("holder_id")
+                holder_name = self._resolve_name(ctx.guild, holder_id) if holder_id else "**Vacant**"
+                
+                term_info = ""
+                if office.get("holder_id") and office.get("term_start_year"):
+                    years_in = nation["current_year"] - office["term_start_year"]
+                    term_info = f"\nIn office: {years_in}/{office['term_years']} years"
+                
+                powers = office["_powers"]
+                powers_str = ", ".join(powers[:3]) if powers else "None"
+                
+                embed.add_field(
+                    name=office["name"],
+                    value=f"Holder: {holder_name}{term_info}\n"
+                          f"Term: {office['term_years']} years\n"
+                          f"Powers: {powers_str}",
+                    inline=True
+                )
+            embeds.append(embed)
         
-        await ctx.send(embed=embed)
+        await _send_embeds(ctx, embeds)
 
     @commands.hybrid_command(name="appoint")
     @commands.has_permissions(administrator=True)
@@ -435,15 +465,15 @@ class GovernmentCog(commands.Cog, name="Government"):
                 await ctx.send("❌ You don't have the power to appoint!")
                 return
         
-        offices = get_offices(ctx.guild.id)
-        office = next((o for o in offices if o["name"].lower() == office_name.lower()), None)
+        office = cached_offices_by_name(ctx.guild.id).get(office_name.lower())
         
         if not office:
             await ctx.send(f"❌ Office '{office_name}' not found. Use `?offices` to see offices.")
             return
         
-        nation = get_or_create_nation(ctx.guild.id)
+        nation = cached_nation(ctx.guild.id)
         appoint_to_office(office["id"], member.id, nation["current_year"])
+        invalidate(ctx.guild.id, "offices")
         
         log_history(ctx.guild.id, nation["current_year"], "appointment",
                    f"{member.display_name} appointed as {office['name']}")
@@ -460,11 +490,12 @@ class GovernmentCog(commands.Cog, name="Government"):
                 await ctx.send("❌ Only administrators or supreme leaders can abolish landlords!")
                 return
         
-        nation = get_or_create_nation(ctx.guild.id)
+        nation = cached_nation(ctx.guild.id)
         do_compensate = compensate.lower() in ["yes", "true", "1"]
         
         count = socialize_property(ctx.guild.id, compensate=do_compensate)
         set_policy(ctx.guild.id, "property_rights_mode", "socialized")
+        invalidate(ctx.guild.id)
         
         comp_str = "with compensation" if do_compensate else "without compensation"
         log_history(ctx.guild.id, nation["current_year"], "revolution",
@@ -478,9 +509,15 @@ class GovernmentCog(commands.Cog, name="Government"):
     @commands.has_permissions(administrator=True)
     async def force_tick(self, ctx: commands.Context):
         """Force a year tick (Admin only, for testing)."""
-        await ctx.send("⏳ Processing year tick...")
+        # The tick runs in a worker thread, so the status message can go out meanwhile
+        status_task = asyncio.create_task(ctx.send("⏳ Processing year tick..."))
         
-        result = await process_year_tick(ctx.guild.id)
+        try:
+            result = await process_year_tick(ctx.guild.id)
+        finally:
+            # Even when the tick fails, wait for the send so its own error is retrieved
+            invalidate(ctx.guild.id)
+            await status_task
         
         embed = discord.Embed(
             title=f"📅 Year {result.year} Complete",
@@ -500,5 +537,13 @@ class GovernmentCog(commands.Cog, name="Government"):
         await ctx.send(embed=embed)
 
 
+_LAW_ACTIONS = {
+    "list": GovernmentCog._law_list,
+    "propose": GovernmentCog._law_propose,
+    "vote": GovernmentCog._law_vote,
+    "info": GovernmentCog._law_info,
+}
+
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(GovernmentCog(bot))
@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
-
 import discord
 from discord.ext import commands
 
@@ -15,6 +13,28 @@ class ModerationCog(commands.Cog, name="Moderation"):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guild_id -> {lowercased role name: role}, rebuilt lazily after role events
+        self._role_name_index: dict[int, dict[str, discord.Role]] = {}
+
+    def _find_role_by_name(self, guild: discord.Guild, name: str) -> discord.Role | None:
+        """Look up a role by name (case-insensitive) using the per-guild index."""
+        index = self._role_name_index.get(guild.id)
+        if index is None:
+            index = {role.name.lower(): role for role in guild.roles}
+            self._role_name_index[guild.id] = index
+        return index.get(name.lower())
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._role_name_index.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._role_name_index.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._role_name_index.pop(role.guild.id, None)
 
     @commands.hybrid_command(name="ban", aliases=["b"])
     @commands.has_permissions(ban_members=True)
@@ -102,9 +122,7 @@ class ModerationCog(commands.Cog, name="Moderation"):
     async def clear(self, ctx: commands.Context, amount: int):
         """Bulk delete messages from the channel."""
         await ctx.channel.purge(limit=amount + 1)
-        msg = await ctx.send(f"Cleaned up the balagan! Removed {amount} messages.")
-        await asyncio.sleep(3)
-        await msg.delete()
+        await ctx.send(f"Cleaned up the balagan! Removed {amount} messages.", delete_after=3)
 
     @commands.hybrid_command(name="role", aliases=["r"])
     @commands.has_permissions(manage_roles=True)
@@ -120,7 +138,7 @@ class ModerationCog(commands.Cog, name="Moderation"):
 
         # If not found, search by name
         if not role:
-            role = discord.utils.get(ctx.guild.roles, name=role_input)
+            role = self._find_role_by_name(ctx.guild, role_input)
 
         if not role:
             await ctx.send("Oy, I couldn't find that role!")
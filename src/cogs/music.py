@@ -3,19 +3,60 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import os
+import socket
+import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Deque, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import discord
 from discord.ext import commands
-import yt_dlp
 
+if TYPE_CHECKING:
+    import yt_dlp
 
+
+# Most of a warm yt-dlp extraction is spent in getaddrinfo for the same few
+# YouTube hosts, so lookups are memoized process-wide for a short TTL. This
+# trades DNS freshness (up to DNS_CACHE_TTL seconds) for throughput.
+DNS_CACHE_TTL = 60.0
+DNS_CACHE_MAX = 256
+
+_dns_cache: Dict[tuple, Tuple[float, list]] = {}
+_real_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = args + tuple(sorted(kwargs.items()))
+    now = time.monotonic()
+    hit = _dns_cache.get(key)
+    if hit and now - hit[0] < DNS_CACHE_TTL:
+        return list(hit[1])
+    result = _real_getaddrinfo(*args, **kwargs)
+    if len(_dns_cache) >= DNS_CACHE_MAX:
+        _dns_cache.clear()
+    _dns_cache[key] = (now, result)
+    return list(result)
+
+
+if not getattr(socket.getaddrinfo, "_cached", False):
+    _cached_getaddrinfo._cached = True
+    socket.getaddrinfo = _cached_getaddrinfo
+
+
+@functools.cache
 def _get_ytdl_options() -> dict:
-    """Build yt-dlp options with cookie support if available."""
+    """Build yt-dlp options with cookie support if available.
+
+    The result is cached, so the cookie and cache paths are only checked
+    once; call `invalidate_ytdl_options` after changing them.
+    """
     options = {
-        "format": "bestaudio/best",
+        # Opus streams can be handed to Discord without re-encoding
+        "format": "bestaudio[acodec=opus]/bestaudio[ext=webm]/bestaudio/best",
         "noplaylist": True,
         "quiet": True,
         "no_warnings": True,
@@ -33,11 +74,13 @@ def _get_ytdl_options() -> dict:
     cookie_paths = [
         Path("/app/data/cookies.txt"),
         Path("data/cookies.txt"),
-        Path(os.getenv("YT_COOKIES_PATH", "")),
     ]
+    env_cookies = os.getenv("YT_COOKIES_PATH")
+    if env_cookies:
+        cookie_paths.append(Path(env_cookies))
     
     for cookie_path in cookie_paths:
-        if cookie_path and cookie_path.exists():
+        if cookie_path.exists():
             options["cookiefile"] = str(cookie_path)
             break
     
@@ -49,31 +92,234 @@ def _get_ytdl_options() -> dict:
     return options
 
 
-YTDL_OPTIONS = _get_ytdl_options()
+def invalidate_ytdl_options() -> None:
+    """Forget the cached yt-dlp options, e.g. after refreshing cookies."""
+    _get_ytdl_options.cache_clear()
+    # Pooled extractors were built with the old options
+    _idle_ydls.clear()
+
+
+def _get_enqueue_options() -> dict:
+    # Queueing only needs a title and page URL; the stream URL is resolved
+    # right before the track plays
+    return {**_get_ytdl_options(), "extract_flat": "in_playlist", "skip_download": True}
+
+
+@functools.cache
+def _yt_dlp():
+    """Import yt-dlp on first use; it loads hundreds of extractor modules."""
+    import yt_dlp
+
+    return yt_dlp
+
+# Resolved track metadata is reused for an hour, which is well inside
+# the lifetime of YouTube's signed stream URLs
+INFO_CACHE_TTL = 3600.0
+INFO_CACHE_MAX = 256
+
+# Tracking parameters that do not change which video a URL points at
+_IGNORED_QUERY_PARAMS = {"si", "feature", "pp"}
+
+
+def _canonical_url(url: str) -> str:
+    """Normalize a URL or search query so equivalent requests share a cache key."""
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.scheme:
+        return url.lower()
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query)
+        if k not in _IGNORED_QUERY_PARAMS and not k.startswith("utm_")
+    ]
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), "")
+    )
+
+
+# Cap on extractions running at once across all guilds; bursts of
+# parallel requests are what trip YouTube's rate limiting
+YT_MAX_CONCURRENT = max(1, int(os.getenv("YT_MAX_CONCURRENT", "4")))
+EXTRACT_RETRIES = 3
+EXTRACT_BACKOFF = 1.0
+
+_extract_sem = asyncio.Semaphore(YT_MAX_CONCURRENT)
+
+# Idle (full, flat) YoutubeDL pairs. Long-lived instances keep yt-dlp's
+# HTTP connections, cookies and extractor state warm between plays, but
+# one instance is not safe to share across concurrent extractions, so
+# each pair is checked out by a single extraction at a time.
+_idle_ydls: List[Tuple["yt_dlp.YoutubeDL", "yt_dlp.YoutubeDL"]] = []
+
+
+def _new_ydl_pair() -> Tuple["yt_dlp.YoutubeDL", "yt_dlp.YoutubeDL"]:
+    yt_dlp = _yt_dlp()
+    ydl = yt_dlp.YoutubeDL(_get_ytdl_options())
+    flat_ydl = yt_dlp.YoutubeDL(_get_enqueue_options())
+    # yt-dlp's request director owns the HTTP handlers; with the `requests`
+    # backend installed it keeps a pooled session, so the flat instance
+    # routes through the full one to share warm connections. A pair is
+    # only ever used by one extraction at a time.
+    if hasattr(ydl, "_request_director") and hasattr(flat_ydl, "_request_director"):
+        flat_ydl._request_director.close()
+        flat_ydl._request_director = ydl._request_director
+    return ydl, flat_ydl
+
+
+def _is_throttled(error: Exception) -> bool:
+    message = str(error)
+    return "429" in message or "Too Many Requests" in message or "Sign in to confirm" in message
+
+
+async def _run_extractor(url: str, flat: bool = False) -> dict:
+    """Run a blocking yt-dlp extraction off the event loop.
+
+    At most YT_MAX_CONCURRENT extractions run at once, and rate-limited
+    attempts are retried with exponential backoff.
+    """
+    attempt = 0
+    while True:
+        async with _extract_sem:
+            pair = _idle_ydls.pop() if _idle_ydls else _new_ydl_pair()
+            ydl = pair[1] if flat else pair[0]
+            try:
+                return await asyncio.to_thread(ydl.extract_info, url, download=False)
+            except asyncio.CancelledError:
+                # The worker thread may still be using this pair; let it go
+                pair = None
+                raise
+            except _yt_dlp().utils.DownloadError as e:
+                attempt += 1
+                if attempt >= EXTRACT_RETRIES or not _is_throttled(e):
+                    raise
+            finally:
+                if pair is not None:
+                    _idle_ydls.append(pair)
+        await asyncio.sleep(EXTRACT_BACKOFF * 2 ** (attempt - 1))
+
 
 FFMPEG_OPTIONS = {
-    "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5",
+    "before_options": (
+        "-nostdin -loglevel quiet "
+        "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+    ),
     "options": "-vn",
 }
 
 
+def _make_source(track: Dict[str, str]) -> discord.FFmpegOpusAudio:
+    """Build an Opus source, passing Opus streams through untouched."""
+    codec = "copy" if track.get("acodec") == "opus" else None
+    return discord.FFmpegOpusAudio(track["url"], codec=codec, **FFMPEG_OPTIONS)
+
+
 class MusicCog(commands.Cog, name="Music"):
     """Music playback commands."""
 
+    MAX_QUEUE = 500
+
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.music_queue: Dict[int, List[Tuple[str, str]]] = {}
-
-    def _play_next(self, ctx: commands.Context):
-        """Play the next song in the queue."""
-        if ctx.guild.id in self.music_queue and self.music_queue[ctx.guild.id]:
-            url, title = self.music_queue[ctx.guild.id].pop(0)
-            source = discord.FFmpegPCMAudio(url, **FFMPEG_OPTIONS)
-            ctx.voice_client.play(source, after=lambda e: self._play_next(ctx))
-            asyncio.run_coroutine_threadsafe(
-                ctx.send(f"Now playing: **{title}** 🎵"),
-                self.bot.loop,
-            )
+        self.music_queue: Dict[int, Deque[Tuple[str, str]]] = {}
+        # canonical url -> (resolved_at, {"url": ..., "title": ...})
+        self._info_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        # guild_id -> (page url, task resolving it) for the next queued track
+        self._prefetch: Dict[int, Tuple[str, asyncio.Task]] = {}
+        # guild_id -> lock held while starting a track, so play() and the
+        # after hook never both call voice_client.play()
+        self._advance_locks: Dict[int, asyncio.Lock] = {}
+
+    async def _extract_info(self, url: str) -> Dict[str, str]:
+        """Resolve a URL or search to a stream URL and title, using the cache."""
+        key = _canonical_url(url)
+        now = time.monotonic()
+        cached = self._info_cache.get(key)
+        if cached and now - cached[0] < INFO_CACHE_TTL:
+            return cached[1]
+
+        info = await _run_extractor(url)
+        now = time.monotonic()
+        if "entries" in info:
+            info = info["entries"][0]
+        track = {
+            "url": info["url"],
+            "title": info.get("title", "Unknown"),
+            "acodec": info.get("acodec") or "",
+        }
+
+        if len(self._info_cache) >= INFO_CACHE_MAX:
+            expired = [k for k, (ts, _) in self._info_cache.items() if now - ts >= INFO_CACHE_TTL]
+            for k in expired:
+                del self._info_cache[k]
+            if len(self._info_cache) >= INFO_CACHE_MAX:
+                del self._info_cache[next(iter(self._info_cache))]
+        self._info_cache[key] = (now, track)
+        return track
+
+    async def _extract_entry(self, url: str) -> Tuple[str, str]:
+        """Resolve a URL or search to a (page url, title) pair without stream formats."""
+        info = await _run_extractor(url, flat=True)
+        if "entries" in info:
+            info = info["entries"][0]
+        page_url = info.get("webpage_url") or info.get("url") or url
+        return page_url, info.get("title", "Unknown")
+
+    def _schedule_prefetch(self, guild_id: int):
+        """Start resolving the head of the queue while the current track plays."""
+        queue = self.music_queue.get(guild_id)
+        if not queue:
+            return
+        page_url = queue[0][0]
+        pending = self._prefetch.get(guild_id)
+        if pending and pending[0] == page_url:
+            return
+        self._cancel_prefetch(guild_id)
+        task = asyncio.create_task(self._extract_info(page_url))
+        # Failures surface when the track is played; don't log them twice
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._prefetch[guild_id] = (page_url, task)
+
+    def _cancel_prefetch(self, guild_id: int):
+        pending = self._prefetch.pop(guild_id, None)
+        if pending:
+            pending[1].cancel()
+
+    async def _resolve_queued(self, guild_id: int, page_url: str) -> Dict[str, str]:
+        """Resolve a queued track, reusing its prefetch task when there is one."""
+        pending = self._prefetch.pop(guild_id, None)
+        if pending:
+            if pending[0] == page_url:
+                return await pending[1]
+            pending[1].cancel()
+        return await self._extract_info(page_url)
+
+    def _after(self, ctx: commands.Context, error: Exception | None):
+        """Player `after` hook; runs on the audio thread and hands off to the loop."""
+        if error:
+            print(f"Player error: {error}")
+        self.bot.loop.call_soon_threadsafe(
+            lambda: self.bot.loop.create_task(self._play_next_async(ctx))
+        )
+
+    def _advance_lock(self, guild_id: int) -> asyncio.Lock:
+        return self._advance_locks.setdefault(guild_id, asyncio.Lock())
+
+    async def _play_next_async(self, ctx: commands.Context):
+        """Resolve and start the next queued track, skipping ones that fail."""
+        async with self._advance_lock(ctx.guild.id):
+            queue = self.music_queue.get(ctx.guild.id)
+            while queue and ctx.voice_client and not ctx.voice_client.is_playing():
+                page_url, title = queue.popleft()
+                try:
+                    track = await self._resolve_queued(ctx.guild.id, page_url)
+                except Exception as e:
+                    await ctx.send(f"Unable to play **{title}**: {e}")
+                    continue
+                source = _make_source(track)
+                ctx.voice_client.play(source, after=lambda e: self._after(ctx, e))
+                self._schedule_prefetch(ctx.guild.id)
+                await ctx.send(f"Now playing: **{title}** 🎵")
+                return
 
     @commands.hybrid_command(name="play", aliases=["p"])
     async def play(self, ctx: commands.Context, *, url: str):
@@ -92,24 +338,32 @@ class MusicCog(commands.Cog, name="Music"):
         await ctx.send(f"Nu, searching for: {url}...")
 
         try:
-            with yt_dlp.YoutubeDL(YTDL_OPTIONS) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if "entries" in info:
-                    info = info["entries"][0]
-
-                audio_url = info["url"]
-                title = info.get("title", "Unknown")
-
-                source = discord.FFmpegPCMAudio(audio_url, **FFMPEG_OPTIONS)
+            if ctx.voice_client.is_playing():
+                queue = self.music_queue.setdefault(ctx.guild.id, deque())
+                if len(queue) >= self.MAX_QUEUE:
+                    await ctx.send(f"The queue is full ({self.MAX_QUEUE} tracks). Skip a few first!")
+                    return
+                page_url, title = await self._extract_entry(url)
+                queue.append((page_url, title))
+                await ctx.send(f"Added to queue: **{title}**")
+                # The current track may have ended while we were extracting
+                await self._play_next_async(ctx)
+                self._schedule_prefetch(ctx.guild.id)
+                return
 
+            track = await self._extract_info(url)
+            title = track["title"]
+            async with self._advance_lock(ctx.guild.id):
+                # A queued track or another play() may have started meanwhile;
+                # queue this one behind it (the extraction is cached)
                 if ctx.voice_client.is_playing():
-                    if ctx.guild.id not in self.music_queue:
-                        self.music_queue[ctx.guild.id] = []
-                    self.music_queue[ctx.guild.id].append((audio_url, title))
+                    self.music_queue.setdefault(ctx.guild.id, deque()).append((url, title))
+                    self._schedule_prefetch(ctx.guild.id)
                     await ctx.send(f"Added to queue: **{title}**")
-                else:
-                    ctx.voice_client.play(source, after=lambda e: self._play_next(ctx))
-                    await ctx.send(f"Now playing: **{title}** 🎵")
+                    return
+                source = _make_source(track)
+                ctx.voice_client.play(source, after=lambda e: self._after(ctx, e))
+            await ctx.send(f"Now playing: **{title}** 🎵")
         except Exception as e:
             await ctx.send(f"Unable to play audio: {e}")
 
@@ -146,6 +400,7 @@ class MusicCog(commands.Cog, name="Music"):
         if ctx.voice_client:
             if ctx.guild.id in self.music_queue:
                 self.music_queue[ctx.guild.id].clear()
+            self._cancel_prefetch(ctx.guild.id)
             ctx.voice_client.stop()
             await ctx.send("Stopped the music.")
         else:
@@ -157,6 +412,7 @@ class MusicCog(commands.Cog, name="Music"):
         if ctx.voice_client:
             if ctx.guild.id in self.music_queue:
                 self.music_queue[ctx.guild.id].clear()
+            self._cancel_prefetch(ctx.guild.id)
             await ctx.voice_client.disconnect()
             await ctx.send("Leaving the voice channel.")
         else:
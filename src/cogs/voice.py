@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 import discord
@@ -11,13 +12,15 @@ from discord.ext import commands
 from config import get_private_voice_lobby_id
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PrivateVoiceSession:
     """Tracks a user's private voice channel."""
 
     owner_id: int
     channel_id: int
     role_id: int
+    # Kept alongside role_id so commands skip the guild role lookup
+    role: Optional[discord.Role] = field(default=None, compare=False, repr=False)
 
 
 class VoiceCog(commands.Cog, name="Voice"):
@@ -27,6 +30,20 @@ class VoiceCog(commands.Cog, name="Voice"):
         self.bot = bot
         self.private_voice_by_owner: Dict[int, PrivateVoiceSession] = {}
         self.private_voice_by_channel: Dict[int, int] = {}
+        # guild_id -> resolved private lobby id, dropped on guild_config_update
+        self._lobby_cache: Dict[int, Optional[int]] = {}
+
+    def _get_lobby_id(self, guild: discord.Guild) -> Optional[int]:
+        try:
+            return self._lobby_cache[guild.id]
+        except KeyError:
+            lobby_id = get_private_voice_lobby_id(guild)
+            self._lobby_cache[guild.id] = lobby_id
+            return lobby_id
+
+    @commands.Cog.listener()
+    async def on_guild_config_update(self, guild_id: int):
+        self._lobby_cache.pop(guild_id, None)
 
     # --- Private voice session management ---
 
@@ -45,11 +62,19 @@ class VoiceCog(commands.Cog, name="Voice"):
             return None
         return self.private_voice_by_owner.get(owner_id)
 
+    def _session_role(
+        self, guild: discord.Guild, session: PrivateVoiceSession
+    ) -> Optional[discord.Role]:
+        role = session.role
+        if role is None:
+            role = guild.get_role(session.role_id)
+        return role
+
     def _get_owner_role(self, guild: discord.Guild, owner_id: int) -> Optional[discord.Role]:
         session = self.private_voice_by_owner.get(owner_id)
         if session is None:
             return None
-        role = guild.get_role(session.role_id)
+        role = self._session_role(guild, session)
         if role is None:
             self._unregister_session(owner_id)
             return None
@@ -66,7 +91,7 @@ class VoiceCog(commands.Cog, name="Voice"):
 
         if existing_session:
             channel = guild.get_channel(existing_session.channel_id)
-            role = guild.get_role(existing_session.role_id)
+            role = self._session_role(guild, existing_session)
             if channel and role:
                 if role not in member.roles:
                     try:
@@ -121,11 +146,15 @@ class VoiceCog(commands.Cog, name="Voice"):
                 owner_id=member.id,
                 channel_id=channel.id,
                 role_id=role.id,
+                role=role,
             )
             self._register_session(session)
 
-            await member.add_roles(role, reason="Granting private voice ownership")
-            await member.move_to(channel)
+            # Independent endpoints, so both requests can be in flight at once
+            await asyncio.gather(
+                member.add_roles(role, reason="Granting private voice ownership"),
+                member.move_to(channel),
+            )
         except Exception as e:
             print(f"Failed to create private voice channel: {e}")
 
@@ -138,22 +167,30 @@ class VoiceCog(commands.Cog, name="Voice"):
             return
 
         guild = channel.guild
-        role = guild.get_role(session.role_id) if guild else None
-
-        try:
-            await channel.delete(reason="Removing empty private voice channel")
-        except Exception as e:
-            print(f"Failed to delete private voice channel: {e}")
+        role = self._session_role(guild, session) if guild else None
 
+        deletions = [channel.delete(reason="Removing empty private voice channel")]
         if role:
-            try:
-                await role.delete(reason="Removing private voice owner role")
-            except Exception as e:
-                print(f"Failed to delete private voice role: {e}")
+            deletions.append(role.delete(reason="Removing private voice owner role"))
+
+        results = await asyncio.gather(*deletions, return_exceptions=True)
+        for kind, result in zip(("channel", "role"), results):
+            if isinstance(result, Exception):
+                print(f"Failed to delete private voice {kind}: {result}")
 
         self._unregister_session(session.owner_id)
 
-    # --- Event listener ---
+    # --- Event listeners ---
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        # A deleted role would otherwise linger as a cached reference
+        owner_id = next(
+            (s.owner_id for s in self.private_voice_by_owner.values() if s.role_id == role.id),
+            None,
+        )
+        if owner_id is not None:
+            self._unregister_session(owner_id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -162,7 +199,7 @@ class VoiceCog(commands.Cog, name="Voice"):
         before_channel = before.channel if before else None
         after_channel = after.channel if after else None
 
-        private_lobby_id = get_private_voice_lobby_id(member.guild)
+        private_lobby_id = self._get_lobby_id(member.guild)
         if (
             after_channel
             and private_lobby_id
@@ -171,7 +208,11 @@ class VoiceCog(commands.Cog, name="Voice"):
         ):
             await self._ensure_private_voice(member, after_channel)
 
-        if before_channel and self._get_session_by_channel(before_channel.id):
+        if (
+            before_channel
+            and self.private_voice_by_channel
+            and before_channel.id in self.private_voice_by_channel
+        ):
             await self._cleanup_private_voice(before_channel)
 
     # --- Commands ---
@@ -1,9 +1,10 @@
 """Voice recording cog (auto-join disabled, database support retained)."""
 
 import asyncio
-import io
-import wave
-from typing import Optional, Dict, Set
+import struct
+import threading
+import warnings
+from typing import Optional, Dict, Set, Tuple
 
 import discord
 from discord.ext import commands
@@ -15,13 +16,77 @@ from services.transcription import (
     end_session,
 )
 
+# audioop is deprecated since 3.11 and removed in 3.13; without it audio
+# is sent to Whisper as recorded
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ImportError:
+    audioop = None
+
+
+# Decoded voice audio from discord: 48 kHz, 16-bit, stereo
+PCM_RATE = 48000
+PCM_CHANNELS = 2
+PCM_SAMPLE_WIDTH = 2
+
+# Whisper works on 16 kHz mono and resamples anything else itself
+WHISPER_RATE = 16000
+
+# Energy gate standing in for a VAD: 20 ms frames whose RMS clears the
+# threshold count as speech, and clips with under 200 ms of it are dropped
+VAD_FRAME_MS = 20
+VAD_RMS_THRESHOLD = 500
+VAD_MIN_SPEECH_FRAMES = 10
+
+# Canonical 44-byte RIFF/WAVE header for uncompressed PCM
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def _downmix_and_resample(pcm: bytes) -> Tuple[bytes, int, int]:
+    """Convert recorded PCM to 16 kHz mono, cutting the upload size by 6x.
+
+    Returns (pcm, rate, channels).
+    """
+    if audioop is None:
+        return pcm, PCM_RATE, PCM_CHANNELS
+    frame_size = PCM_CHANNELS * PCM_SAMPLE_WIDTH
+    if len(pcm) % frame_size:
+        pcm = pcm[: len(pcm) - len(pcm) % frame_size]
+    mono = audioop.tomono(pcm, PCM_SAMPLE_WIDTH, 0.5, 0.5)
+    resampled, _ = audioop.ratecv(mono, PCM_SAMPLE_WIDTH, 1, PCM_RATE, WHISPER_RATE, None)
+    return resampled, WHISPER_RATE, 1
+
+
+def _trim_to_speech(pcm: bytes, rate: int, channels: int) -> Optional[memoryview]:
+    """Trim leading and trailing silence, or return None if there is too little speech.
+
+    The result is a view into `pcm`, so trimming does not copy the audio.
+    """
+    view = memoryview(pcm)
+    if audioop is None:
+        return view
+    frame_size = rate * channels * PCM_SAMPLE_WIDTH * VAD_FRAME_MS // 1000
+    voiced = [
+        start
+        for start in range(0, len(pcm) - frame_size + 1, frame_size)
+        if audioop.rms(view[start:start + frame_size], PCM_SAMPLE_WIDTH) >= VAD_RMS_THRESHOLD
+    ]
+    if len(voiced) < VAD_MIN_SPEECH_FRAMES:
+        return None
+    return view[voiced[0]:voiced[-1] + frame_size]
+
 
 class AudioSink(voice_recv.AudioSink):
     """Custom audio sink that collects audio per user."""
 
     def __init__(self):
         super().__init__()
-        self.audio_data: Dict[int, io.BytesIO] = {}
+        self.audio_data: Dict[int, bytearray] = {}
+        # write() runs on the receive thread; the lock keeps a drain from
+        # taking a buffer while a packet is being appended to it
+        self._lock = threading.Lock()
 
     def wants_opus(self) -> bool:
         """We want decoded PCM data, not opus."""
@@ -33,22 +98,38 @@ class AudioSink(voice_recv.AudioSink):
             return
         user_id = user.id if hasattr(user, 'id') else user
         
-        if user_id not in self.audio_data:
-            self.audio_data[user_id] = io.BytesIO()
         # data.pcm contains the decoded PCM audio
-        if data.pcm:
-            self.audio_data[user_id].write(data.pcm)
+        if not data.pcm:
+            return
+        with self._lock:
+            buf = self.audio_data.get(user_id)
+            if buf is None:
+                buf = self.audio_data[user_id] = bytearray()
+            buf.extend(data.pcm)
 
     def get_user_audio(self, user_id: int) -> Optional[bytes]:
         """Get collected audio for a user and clear the buffer."""
-        if user_id in self.audio_data:
-            data = self.audio_data[user_id].getvalue()
-            self.audio_data[user_id] = io.BytesIO()  # Reset
-            return data if len(data) > 1000 else None
-        return None
+        with self._lock:
+            buf = self.audio_data.pop(user_id, None)
+        if buf is None or len(buf) <= 1000:
+            return None
+        return bytes(buf)
+
+    def drain(self, min_bytes: int = 1000) -> Dict[int, bytes]:
+        """Collect every user's audio in one pass, keeping clips over min_bytes."""
+        # Swap in a fresh dict so the receive thread starts new buffers
+        # while the old ones are copied out
+        with self._lock:
+            taken, self.audio_data = self.audio_data, {}
+        return {
+            user_id: bytes(buf)
+            for user_id, buf in taken.items()
+            if len(buf) > min_bytes
+        }
 
     def cleanup(self):
-        self.audio_data.clear()
+        with self._lock:
+            self.audio_data = {}
 
 
 class VoiceRecordCog(commands.Cog):
@@ -153,27 +234,68 @@ class VoiceRecordCog(commands.Cog):
                 if channel_id not in self.active_sinks:
                     break
 
-                for user_id in list(sink.audio_data.keys()):
-                    audio_bytes = sink.get_user_audio(user_id)
-                    if audio_bytes and len(audio_bytes) > 5000:
-                        username = self.user_names.get(user_id, str(user_id))
-                        wav_data = self._pcm_to_wav(audio_bytes)
-                        await session.process_audio(wav_data, user_id, username)
+                # Transcribe every speaker from this cycle concurrently
+                ready = sink.drain(min_bytes=5000)
+                if not ready:
+                    continue
+                tasks = [
+                    asyncio.create_task(self._transcribe_user(session, user_id, audio_bytes))
+                    for user_id, audio_bytes in ready.items()
+                ]
+                for result in await asyncio.gather(*tasks, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        print(f"Transcription error: {result}")
 
         except asyncio.CancelledError:
             pass
         except Exception as e:
             print(f"Transcription error: {e}")
 
-    def _pcm_to_wav(self, pcm_data: bytes) -> bytes:
+    async def _transcribe_user(
+        self, session: VoiceRecordingSession, user_id: int, audio_bytes: bytes
+    ):
+        """Encode one speaker's audio for this cycle and hand it to the session."""
+        encoded = await asyncio.to_thread(self._encode_for_whisper, audio_bytes)
+        if encoded is None:
+            # Silence or background noise; not worth a Whisper call
+            return
+        wav_data, duration = encoded
+        username = self.user_names.get(user_id, str(user_id))
+        await session.process_audio(wav_data, user_id, username, duration_secs=duration)
+
+    def _encode_for_whisper(self, audio_bytes: bytes) -> Optional[Tuple[bytes, float]]:
+        """Downmix, resample, trim and wrap recorded PCM; CPU-bound, run it in a thread.
+
+        Returns the WAV and its duration in seconds, or None if no speech was found.
+        """
+        pcm, rate, channels = _downmix_and_resample(audio_bytes)
+        speech = _trim_to_speech(pcm, rate, channels)
+        if speech is None:
+            return None
+        duration = len(speech) / (rate * channels * PCM_SAMPLE_WIDTH)
+        return self._pcm_to_wav(speech, rate, channels), duration
+
+    def _pcm_to_wav(
+        self, pcm_data: bytes | memoryview, rate: int = PCM_RATE, channels: int = PCM_CHANNELS
+    ) -> bytes:
         """Convert raw PCM audio to WAV format for Whisper."""
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(2)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(48000)
-            wav_file.writeframes(pcm_data)
-        return wav_buffer.getvalue()
+        block_align = channels * PCM_SAMPLE_WIDTH
+        header = _WAV_HEADER.pack(
+            b"RIFF",
+            36 + len(pcm_data),
+            b"WAVE",
+            b"fmt ",
+            16,  # fmt chunk size
+            1,  # PCM
+            channels,
+            rate,
+            rate * block_align,
+            block_align,
+            PCM_SAMPLE_WIDTH * 8,
+            b"data",
+            len(pcm_data),
+        )
+        return header + pcm_data
 
     def _get_human_count(self, channel: discord.VoiceChannel) -> int:
         """Count non-bot members in a voice channel."""
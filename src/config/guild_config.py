@@ -8,6 +8,22 @@ from typing import Dict
 
 import discord
 
+# Use orjson when it is installed; it parses bytes directly and is much faster
+try:
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data: bytes):
+        return json.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
 from .settings import (
     GUILD_CONFIG_PATH,
     PRIMARY_GUILD_ID,
@@ -19,6 +35,8 @@ from .settings import (
     DEFAULT_PRIVATE_VOICE_LOBBY_ID,
 )
 
+_DEFAULT_VOICE_CHANNEL_IDS: frozenset[int] = frozenset(DEFAULT_VOICE_CHANNEL_IDS)
+
 
 @dataclass
 class GuildSettings:
@@ -28,7 +46,7 @@ class GuildSettings:
     gem_role_id: int | None = None
     gem_trigger_phrase: str = GEM_TRIGGER_PHRASE
     audit_log_channel_id: int | None = None
-    voice_channel_ids: set[int] | None = None
+    voice_channel_ids: frozenset[int] | None = None
     private_voice_lobby_id: int | None = None
 
     @classmethod
@@ -41,7 +59,9 @@ class GuildSettings:
             audit_log_channel_id=int(data.get("audit_log_channel_id"))
             if data.get("audit_log_channel_id")
             else None,
-            voice_channel_ids={int(v) for v in voice_channels} if voice_channels else None,
+            voice_channel_ids=frozenset(int(v) for v in voice_channels)
+            if voice_channels
+            else None,
             private_voice_lobby_id=int(data.get("private_voice_lobby_id"))
             if data.get("private_voice_lobby_id")
             else None,
@@ -58,14 +78,19 @@ class GuildSettings:
 # In-memory guild settings cache
 guild_settings: Dict[int, GuildSettings] = {}
 
+# Merged settings (defaults + overrides) per guild; cleared whenever the
+# overrides are loaded or saved
+_merged_cache: Dict[int, GuildSettings] = {}
+
 
 def load_guild_configs() -> None:
     """Load guild configurations from disk."""
     if not GUILD_CONFIG_PATH.exists():
         return
 
+    _merged_cache.clear()
     try:
-        data = json.loads(GUILD_CONFIG_PATH.read_text())
+        data = _loads(GUILD_CONFIG_PATH.read_bytes())
         for key, value in data.items():
             try:
                 guild_settings[int(key)] = GuildSettings.from_dict(value)
@@ -77,9 +102,10 @@ def load_guild_configs() -> None:
 
 def save_guild_configs() -> None:
     """Persist guild configurations to disk."""
+    _merged_cache.clear()
     try:
         serializable = {str(k): v.to_dict() for k, v in guild_settings.items()}
-        GUILD_CONFIG_PATH.write_text(json.dumps(serializable, indent=2))
+        GUILD_CONFIG_PATH.write_bytes(_dumps(serializable))
     except Exception as e:
         print(f"Failed to save guild configs: {e}")
 
@@ -89,6 +115,13 @@ def get_guild_settings(guild_id: int | None) -> GuildSettings:
     if guild_id is None:
         return GuildSettings()
 
+    settings = _merged_cache.get(guild_id)
+    if settings is None:
+        settings = _merged_cache[guild_id] = _merge_guild_settings(guild_id)
+    return settings
+
+
+def _merge_guild_settings(guild_id: int) -> GuildSettings:
     base_settings = GuildSettings()
     if PRIMARY_GUILD_ID == 0 or guild_id == PRIMARY_GUILD_ID:
         base_settings = GuildSettings(
@@ -96,7 +129,7 @@ def get_guild_settings(guild_id: int | None) -> GuildSettings:
             gem_role_id=GEM_ROLE_ID or None,
             gem_trigger_phrase=GEM_TRIGGER_PHRASE,
             audit_log_channel_id=AUDIT_LOG_CHANNEL_ID or None,
-            voice_channel_ids=set(DEFAULT_VOICE_CHANNEL_IDS),
+            voice_channel_ids=_DEFAULT_VOICE_CHANNEL_IDS,
             private_voice_lobby_id=DEFAULT_PRIVATE_VOICE_LOBBY_ID or None,
         )
 
@@ -145,22 +178,15 @@ def get_audit_log_channel_id(guild: discord.Guild | None) -> int | None:
     return settings.audit_log_channel_id
 
 
-def get_voice_channel_ids(guild: discord.Guild | None) -> set[int]:
+def get_voice_channel_ids(guild: discord.Guild | None) -> frozenset[int]:
+    # Defaults for the primary guild are already merged into its settings
     settings = get_guild_settings(guild.id if guild else None)
-    if settings.voice_channel_ids is not None:
-        return set(settings.voice_channel_ids)
-    if guild and PRIMARY_GUILD_ID and guild.id == PRIMARY_GUILD_ID:
-        return set(DEFAULT_VOICE_CHANNEL_IDS)
-    return set()
+    return settings.voice_channel_ids or frozenset()
 
 
 def get_private_voice_lobby_id(guild: discord.Guild | None) -> int | None:
     settings = get_guild_settings(guild.id if guild else None)
-    if settings.private_voice_lobby_id is not None:
-        return settings.private_voice_lobby_id
-    if guild and PRIMARY_GUILD_ID and guild.id == PRIMARY_GUILD_ID:
-        return DEFAULT_PRIVATE_VOICE_LOBBY_ID
-    return None
+    return settings.private_voice_lobby_id
 
 
 # Load configs on module import
@@ -7,9 +7,10 @@ Uses Rust acceleration when available for performance.
 from __future__ import annotations
 
 import random
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
 
 import discord
 
@@ -20,6 +21,37 @@ try:
 except ImportError:
     _USE_RUST = False
 
+# Anti-spam: more than SPAM_THRESHOLD messages in SPAM_WINDOW seconds
+SPAM_WINDOW = 10.0
+SPAM_THRESHOLD = 20
+# Per-user timestamp ring size; one past the threshold is enough to flag spam
+SPAM_HISTORY = SPAM_THRESHOLD + 1
+# Users idle for a full window are dropped once the map reaches this size
+# (then twice the size left after each sweep); their rings are recycled
+SPAM_SWEEP_MIN = 1024
+SPAM_SPARE_MAX = 1024
+
+# Conversation detection, see ActivityTracker.record_chat_activity
+CHAT_WINDOW = 20.0
+CHAT_MIN_MESSAGES = 6
+CHAT_MIN_USERS = 3
+CHAT_COOLDOWN = 45.0
+CHAT_TRIGGER_CHANCE = 0.35
+
+
+def _timestamp(now: datetime | float | None) -> float:
+    """Seconds for `now`, defaulting to the monotonic clock.
+
+    Only differences between timestamps are used, so callers may pass their
+    own float clock reading; datetimes are converted to epoch seconds. A
+    tracker should be fed one kind of timestamp consistently.
+    """
+    if now is None:
+        return time.monotonic()
+    if isinstance(now, datetime):
+        return now.timestamp()
+    return now
+
 
 class ActivityTracker:
     """Tracks message activity for anti-spam and chat engagement detection.
@@ -30,49 +62,110 @@ class ActivityTracker:
 
     def __init__(self, bot_prefix: str = "?"):
         self.bot_prefix = bot_prefix
+        # Single-character prefixes are checked by indexing instead of startswith
+        self._prefix_char = bot_prefix if len(bot_prefix) == 1 else None
         
         if _USE_RUST:
             self._rust_tracker = ActivityTrackerRust()
         else:
             # Python fallback
-            self._message_timestamps: Dict[int, list[datetime]] = defaultdict(list)
-            self._chat_activity: Dict[int, deque[Tuple[datetime, int]]] = defaultdict(deque)
-            self._chat_cooldowns: Dict[int, datetime] = {}
-
-    def check_spam(self, user_id: int, now: datetime | None = None) -> Tuple[bool, int]:
+            self._message_timestamps: Dict[int, deque[float]] = {}
+            # Rings released by clear_user and idle sweeps, reused for new users
+            self._spare_timestamps: List[deque[float]] = []
+            self._sweep_at = SPAM_SWEEP_MIN
+            self._chat_activity: Dict[int, deque[Tuple[float, int]]] = defaultdict(deque)
+            # Per-guild message counts by user for the entries in _chat_activity
+            self._chat_users: Dict[int, Counter[int]] = defaultdict(Counter)
+            self._chat_cooldowns: Dict[int, float] = {}
+
+    def check_spam(self, user_id: int, now: datetime | float | None = None) -> Tuple[bool, int]:
         """Check if a user is spamming.
         
         Returns (is_spam, message_count_in_window).
-        Spam threshold: >20 messages in 10 seconds.
+        Spam threshold: >20 messages in 10 seconds. The count stops at
+        SPAM_HISTORY since older timestamps fall out of the ring.
         """
-        if now is None:
-            now = datetime.now()
+        now_ts = _timestamp(now)
 
         if _USE_RUST:
-            return self._rust_tracker.check_spam(user_id, now.timestamp())
+            return self._rust_tracker.check_spam(user_id, now_ts)
 
         # Python fallback
-        timestamps = self._message_timestamps[user_id]
+        timestamps = self._user_timestamps(user_id, now_ts)
         
-        # Clean old timestamps (older than 10 seconds)
-        cutoff = now - timedelta(seconds=10)
-        timestamps[:] = [ts for ts in timestamps if ts > cutoff]
+        # Clean old timestamps (older than 10 seconds); they sit at the front
+        cutoff = now_ts - SPAM_WINDOW
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
         
         # Add current timestamp
-        timestamps.append(now)
+        timestamps.append(now_ts)
         
         count = len(timestamps)
-        is_spam = count > 20
+        is_spam = count > SPAM_THRESHOLD
         
         return is_spam, count
 
+    def check_spam_batch(
+        self, user_ids: Iterable[int], now: datetime | float | None = None
+    ) -> Dict[int, Tuple[bool, int]]:
+        """Run `check_spam` for many users at one timestamp.
+
+        Returns {user_id: (is_spam, message_count_in_window)}.
+        """
+        now_ts = _timestamp(now)
+
+        if _USE_RUST:
+            check = self._rust_tracker.check_spam
+            return {user_id: check(user_id, now_ts) for user_id in user_ids}
+
+        # Python fallback; same pruning as check_spam with the cutoff computed once
+        cutoff = now_ts - SPAM_WINDOW
+        all_timestamps = self._message_timestamps
+        results: Dict[int, Tuple[bool, int]] = {}
+        for user_id in user_ids:
+            timestamps = all_timestamps.get(user_id)
+            if timestamps is None:
+                timestamps = self._user_timestamps(user_id, now_ts)
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+            timestamps.append(now_ts)
+            count = len(timestamps)
+            results[user_id] = (count > SPAM_THRESHOLD, count)
+        return results
+
+    def _user_timestamps(self, user_id: int, now_ts: float) -> deque[float]:
+        timestamps = self._message_timestamps.get(user_id)
+        if timestamps is None:
+            if len(self._message_timestamps) >= self._sweep_at:
+                self._sweep_idle(now_ts - SPAM_WINDOW)
+            if self._spare_timestamps:
+                timestamps = self._spare_timestamps.pop()
+            else:
+                timestamps = deque(maxlen=SPAM_HISTORY)
+            self._message_timestamps[user_id] = timestamps
+        return timestamps
+
+    def _sweep_idle(self, cutoff: float) -> None:
+        """Drop users with no message since `cutoff`; they count as zero anyway."""
+        all_timestamps = self._message_timestamps
+        idle = [uid for uid, ts in all_timestamps.items() if not ts or ts[-1] <= cutoff]
+        for uid in idle:
+            self._release_timestamps(all_timestamps.pop(uid))
+        self._sweep_at = max(SPAM_SWEEP_MIN, 2 * len(all_timestamps))
+
+    def _release_timestamps(self, timestamps: deque[float]) -> None:
+        if len(self._spare_timestamps) < SPAM_SPARE_MAX:
+            timestamps.clear()
+            self._spare_timestamps.append(timestamps)
+
     def record_chat_activity(
         self,
         guild_id: int,
         user_id: int,
         is_bot: bool,
         content: str | None,
-        now: datetime | None = None,
+        now: datetime | float | None = None,
     ) -> bool:
         """Record chat activity and determine if bot should jump into conversation.
         
@@ -84,43 +177,46 @@ class ActivityTracker:
         - 45 second cooldown between triggers
         - 35% random chance when criteria met
         """
-        if now is None:
-            now = datetime.utcnow()
-
         # Skip bots and commands
         if is_bot:
             return False
-        if content and content.startswith(self.bot_prefix):
-            return False
+        if content:
+            if self._prefix_char is not None:
+                if content[0] == self._prefix_char:
+                    return False
+            elif content.startswith(self.bot_prefix):
+                return False
+
+        now_ts = _timestamp(now)
 
         if _USE_RUST:
-            return self._rust_tracker.record_chat_activity(
-                guild_id, user_id, now.timestamp()
-            )
+            return self._rust_tracker.record_chat_activity(guild_id, user_id, now_ts)
 
         # Python fallback
         window = self._chat_activity[guild_id]
-        window.append((now, user_id))
-
-        # Clean messages older than 30 seconds
-        while window and (now - window[0][0]) > timedelta(seconds=30):
-            window.popleft()
-
-        # Check activity in last 20 seconds
-        active_window = [(ts, uid) for ts, uid in window if (now - ts) <= timedelta(seconds=20)]
-        unique_users = {uid for _, uid in active_window}
-
-        if len(active_window) < 6 or len(unique_users) < 3:
+        users = self._chat_users[guild_id]
+        window.append((now_ts, user_id))
+        users[user_id] += 1
+
+        # Only the last 20 seconds count, so older messages are dropped and
+        # the window and user counts can be read off directly
+        while window and now_ts - window[0][0] > CHAT_WINDOW:
+            _, old_uid = window.popleft()
+            users[old_uid] -= 1
+            if not users[old_uid]:
+                del users[old_uid]
+
+        if len(window) < CHAT_MIN_MESSAGES or len(users) < CHAT_MIN_USERS:
             return False
 
         # Check cooldown
         last_trigger = self._chat_cooldowns.get(guild_id)
-        if last_trigger and (now - last_trigger) < timedelta(seconds=45):
+        if last_trigger and now_ts - last_trigger < CHAT_COOLDOWN:
             return False
 
         # Random chance to trigger
-        if random.random() < 0.35:
-            self._chat_cooldowns[guild_id] = now
+        if random.random() < CHAT_TRIGGER_CHANCE:
+            self._chat_cooldowns[guild_id] = now_ts
             return True
 
         return False
@@ -130,7 +226,9 @@ class ActivityTracker:
         if _USE_RUST:
             self._rust_tracker.clear_user(user_id)
         else:
-            self._message_timestamps.pop(user_id, None)
+            timestamps = self._message_timestamps.pop(user_id, None)
+            if timestamps is not None:
+                self._release_timestamps(timestamps)
 
     def clear_guild(self, guild_id: int) -> None:
         """Clear tracking data for a guild."""
@@ -138,4 +236,5 @@ class ActivityTracker:
             self._rust_tracker.clear_guild(guild_id)
         else:
             self._chat_activity.pop(guild_id, None)
+            self._chat_users.pop(guild_id, None)
             self._chat_cooldowns.pop(guild_id, None)
@@ -6,5 +6,13 @@ from discord.ext import commands
 
 intents = discord.Intents.default()
 intents.message_content = True
+# Presences and members stay off (the default). Gateway events no cog
+# listens for are dropped too; typing alone fires on nearly every message.
+intents.typing = False
+intents.invites = False
+intents.webhooks = False
+intents.integrations = False
+intents.auto_moderation = False
+intents.guild_scheduled_events = False
 
 bot = commands.Bot(command_prefix="?", intents=intents, help_command=None)
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import logging
+import re
+from typing import Optional
+
 import discord
 from discord.ext import commands
 
 from services.llm import fetch_channel_context, generate_chatbot_reply
 
+log = logging.getLogger("events")
+
 
 async def _send_chatbot_reply(
     message: discord.Message,
@@ -18,20 +24,23 @@ async def _send_chatbot_reply(
     if not prompt.strip():
         prompt = "Say hello and offer to help."
 
+    guild = message.guild
+    author = message.author
+    channel = message.channel
     try:
-        async with message.channel.typing():
-            channel_context = await fetch_channel_context(message.channel, limit=20)
+        async with channel.typing():
+            channel_context = await fetch_channel_context(channel, limit=20)
             reply_text = await generate_chatbot_reply(
                 user_message=prompt,
-                username=message.author.display_name,
-                guild_name=message.guild.name if message.guild else None,
-                guild_id=message.guild.id if message.guild else None,
-                user_id=message.author.id,
-                channel_id=message.channel.id,
+                username=author.display_name,
+                guild_name=guild.name if guild else None,
+                guild_id=guild.id if guild else None,
+                user_id=author.id,
+                channel_id=channel.id,
                 channel_context=channel_context,
             )
     except Exception as exc:
-        print(f"Chatbot reply failed: {exc}")
+        log.exception("Chatbot reply failed: %s", exc)
         return
 
     if not reply_text:
@@ -40,14 +49,19 @@ async def _send_chatbot_reply(
     if reply_to_message:
         await message.reply(reply_text, mention_author=False)
     else:
-        await message.channel.send(reply_text)
+        await channel.send(reply_text)
 
 
 def setup_events(bot: commands.Bot) -> None:
     """Register the small set of events needed for a chatbot-only bot."""
 
+    # Matches both <@id> and <@!id> mentions of the bot; compiled once ready
+    bot_mention_re: Optional[re.Pattern[str]] = None
+
     @bot.event
     async def on_ready() -> None:
+        nonlocal bot_mention_re
+        bot_mention_re = re.compile(rf"<@!?{bot.user.id}>")
         print(f"{bot.user} is online as a chatbot.")
         await bot.change_presence(activity=discord.Game(name="Chat with Israel GPT"))
 
@@ -58,13 +72,15 @@ def setup_events(bot: commands.Bot) -> None:
 
         # DMs are always chatbot conversations. In servers, reply only when mentioned
         # so the bot stays a simple assistant instead of moderating or automating the guild.
-        is_dm = message.guild is None
-        mentioned_bot = bot.user is not None and bot.user in message.mentions
+        guild = message.guild
+        bot_user = bot.user
+        is_dm = guild is None
+        mentioned_bot = bot_user is not None and bot_user in message.mentions
         if not is_dm and not mentioned_bot:
             return
 
         prompt = message.content or ""
-        if mentioned_bot and message.guild is not None and message.guild.me is not None:
-            prompt = prompt.replace(message.guild.me.mention, "").strip()
+        if mentioned_bot and bot_mention_re is not None:
+            prompt = bot_mention_re.sub("", prompt).strip()
 
         await _send_chatbot_reply(message, prompt, reply_to_message=not is_dm)
@@ -1,40 +1,238 @@
-from datetime import datetime
-from typing import Optional, Dict
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Tuple
 
-from .engine import get_connection
+from .engine import get_connection, using_postgres
+
+# WAL lets get_message read while logs are written, and NORMAL
+# synchronous skips the per-commit fsync of the main database file
+_SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA wal_autocheckpoint=1000;
+"""
 
 _conn = get_connection("audit.db")
 
-_conn.execute(
-    """
-    CREATE TABLE IF NOT EXISTS message_log (
-        message_id INTEGER PRIMARY KEY,
-        guild_id INTEGER,
-        channel_id INTEGER,
-        author_id INTEGER,
-        content TEXT,
-        created_at TEXT NOT NULL
+if not using_postgres():
+    _conn.executescript(_SQLITE_PRAGMAS)
+
+# Timestamps are stored as integer microseconds since the Unix epoch (UTC)
+_MESSAGE_LOG_COLUMNS = """
+    message_id INTEGER PRIMARY KEY,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    author_id INTEGER,
+    content TEXT,
+    created_at INTEGER NOT NULL
+"""
+
+_MESSAGE_DELETIONS_COLUMNS = """
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id INTEGER,
+    guild_id INTEGER,
+    channel_id INTEGER,
+    author_id INTEGER,
+    deleter_id INTEGER,
+    content TEXT,
+    created_at INTEGER,
+    deleted_at INTEGER NOT NULL
+"""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime | None) -> int:
+    """Epoch microseconds for a datetime; naive values are taken as UTC."""
+    if value is None:
+        return time.time_ns() // 1000
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+_conn.execute(f"CREATE TABLE IF NOT EXISTS message_log ({_MESSAGE_LOG_COLUMNS})")
+_conn.execute(f"CREATE TABLE IF NOT EXISTS message_deletions ({_MESSAGE_DELETIONS_COLUMNS})")
+
+
+def _column_type(table: str, column: str) -> str:
+    for row in _conn.execute(f"PRAGMA table_info({table})"):
+        if row["name"] == column:
+            return row["type"].upper()
+    return ""
+
+
+if not using_postgres():
+    # Databases created before the switch to integer timestamps hold ISO text
+    _conn.create_function(
+        "iso_to_micros",
+        1,
+        lambda text: _to_micros(datetime.fromisoformat(text)) if text else None,
+        deterministic=True,
     )
-    """
-)
+    if _column_type("message_log", "created_at") == "TEXT":
+        _conn.executescript(
+            f"""
+            BEGIN;
+            ALTER TABLE message_log RENAME TO message_log_old;
+            CREATE TABLE message_log ({_MESSAGE_LOG_COLUMNS});
+            INSERT INTO message_log
+                SELECT message_id, guild_id, channel_id, author_id, content,
+                       iso_to_micros(created_at)
+                FROM message_log_old;
+            DROP TABLE message_log_old;
+            COMMIT;
+            """
+        )
+    if _column_type("message_deletions", "deleted_at") == "TEXT":
+        _conn.executescript(
+            f"""
+            BEGIN;
+            ALTER TABLE message_deletions RENAME TO message_deletions_old;
+            CREATE TABLE message_deletions ({_MESSAGE_DELETIONS_COLUMNS});
+            INSERT INTO message_deletions
+                SELECT id, message_id, guild_id, channel_id, author_id, deleter_id, content,
+                       iso_to_micros(created_at),
+                       iso_to_micros(deleted_at)
+                FROM message_deletions_old;
+            DROP TABLE message_deletions_old;
+            COMMIT;
+            """
+        )
 
 _conn.execute(
-    """
-    CREATE TABLE IF NOT EXISTS message_deletions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        message_id INTEGER,
-        guild_id INTEGER,
-        channel_id INTEGER,
-        author_id INTEGER,
-        deleter_id INTEGER,
-        content TEXT,
-        created_at TEXT,
-        deleted_at TEXT NOT NULL
-    )
-    """
+    "CREATE INDEX IF NOT EXISTS idx_deletions_guild_deleted ON message_deletions(guild_id, deleted_at)"
 )
 _conn.commit()
 
+# SQL text is kept in module constants and each connection runs it through
+# one long-lived cursor, so statements are compiled once and then served
+# from the connection's statement cache (128 entries by default)
+_GET_MESSAGE_SQL = (
+    "SELECT guild_id, channel_id, author_id, content, created_at FROM message_log WHERE message_id=?"
+)
+
+_RECORD_DELETION_SQL = """
+    INSERT INTO message_deletions (
+        message_id,
+        guild_id,
+        channel_id,
+        author_id,
+        deleter_id,
+        content,
+        created_at,
+        deleted_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_LOG_MESSAGE_SQL = """
+    INSERT INTO message_log (message_id, guild_id, channel_id, author_id, content, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(message_id) DO UPDATE SET
+        content=excluded.content,
+        guild_id=excluded.guild_id,
+        channel_id=excluded.channel_id,
+        author_id=excluded.author_id
+"""
+
+_cursor = _conn.cursor()
+
+# All audit writes go through a single background thread with its own
+# connection. It commits up to AUDIT_BATCH_SIZE queued rows per
+# transaction, waiting at most AUDIT_FLUSH_INTERVAL to fill a batch.
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.05  # seconds
+AUDIT_QUEUE_SIZE = 10_000
+
+_MessageRow = Tuple[int, Optional[int], Optional[int], Optional[int], str, int]
+# ("log" | "deletion", row); None asks the writer to stop
+_audit_q: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+# message_id -> logged row the writer has not committed yet, so reads see it
+_unflushed: Dict[int, _MessageRow] = {}
+_unflushed_lock = threading.Lock()
+# Writes dropped because the queue was full
+dropped_writes = 0
+
+
+def _enqueue(kind: str, row: tuple) -> bool:
+    global dropped_writes
+    try:
+        _audit_q.put_nowait((kind, row))
+        return True
+    except queue.Full:
+        dropped_writes += 1
+        if dropped_writes % 1000 == 1:
+            print(f"Audit write queue full; {dropped_writes} writes dropped so far")
+        return False
+
+
+def _write_batch(conn, cursor, batch: List[Tuple[str, tuple]]) -> None:
+    logs = [row for kind, row in batch if kind == "log"]
+    deletions = [row for kind, row in batch if kind == "deletion"]
+    try:
+        if logs:
+            cursor.executemany(_LOG_MESSAGE_SQL, logs)
+        if deletions:
+            cursor.executemany(_RECORD_DELETION_SQL, deletions)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Failed to write audit batch: {e}")
+    with _unflushed_lock:
+        for row in logs:
+            if _unflushed.get(row[0]) is row:
+                del _unflushed[row[0]]
+
+
+def _audit_writer_loop() -> None:
+    conn = get_connection("audit.db")
+    if not using_postgres():
+        conn.executescript(_SQLITE_PRAGMAS)
+    cursor = conn.cursor()
+    while True:
+        item = _audit_q.get()
+        if item is None:
+            return
+        batch = [item]
+        stop = False
+        deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+        while len(batch) < AUDIT_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _audit_q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        _write_batch(conn, cursor, batch)
+        if stop:
+            return
+
+
+_writer = threading.Thread(target=_audit_writer_loop, name="audit-writer", daemon=True)
+_writer.start()
+
+
+@atexit.register
+def _stop_audit_writer() -> None:
+    """Let the writer commit what is queued before the process exits."""
+    try:
+        _audit_q.put(None, timeout=1)
+    except queue.Full:
+        return
+    _writer.join(timeout=5)
+
 
 def log_message(
     *,
@@ -45,28 +243,30 @@ def log_message(
     content: str,
     created_at: datetime | None = None,
 ) -> None:
-    ts = (created_at or datetime.utcnow()).isoformat()
-    _conn.execute(
-        """
-        INSERT INTO message_log (message_id, guild_id, channel_id, author_id, content, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(message_id) DO UPDATE SET
-            content=excluded.content,
-            guild_id=excluded.guild_id,
-            channel_id=excluded.channel_id,
-            author_id=excluded.author_id
-        """,
-        (message_id, guild_id, channel_id, author_id, content, ts),
-    )
-    _conn.commit()
+    ts = _to_micros(created_at)
+    row = (message_id, guild_id, channel_id, author_id, content, ts)
+    with _unflushed_lock:
+        _unflushed[message_id] = row
+    if not _enqueue("log", row):
+        with _unflushed_lock:
+            if _unflushed.get(message_id) is row:
+                del _unflushed[message_id]
 
 
 def get_message(message_id: int) -> Optional[Dict]:
-    cur = _conn.execute(
-        "SELECT guild_id, channel_id, author_id, content, created_at FROM message_log WHERE message_id=?",
-        (message_id,),
-    )
-    row = cur.fetchone()
+    with _unflushed_lock:
+        pending = _unflushed.get(message_id)
+    if pending is not None:
+        _, guild_id, channel_id, author_id, content, created_at = pending
+        return {
+            "guild_id": guild_id,
+            "channel_id": channel_id,
+            "author_id": author_id,
+            "content": content,
+            "created_at": created_at,
+        }
+
+    row = _cursor.execute(_GET_MESSAGE_SQL, (message_id,)).fetchone()
     if row is None:
         return None
     return {
@@ -86,24 +286,11 @@ def record_deletion(
     author_id: int | None,
     deleter_id: int | None,
     content: str,
-    created_at: str | None,
+    created_at: int | None,
     deleted_at: datetime | None = None,
 ) -> None:
-    ts = (deleted_at or datetime.utcnow()).isoformat()
-    _conn.execute(
-        """
-        INSERT INTO message_deletions (
-            message_id,
-            guild_id,
-            channel_id,
-            author_id,
-            deleter_id,
-            content,
-            created_at,
-            deleted_at
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+    ts = _to_micros(deleted_at)
+    _enqueue(
+        "deletion",
         (message_id, guild_id, channel_id, author_id, deleter_id, content, created_at, ts),
     )
-    _conn.commit()
@@ -1,14 +1,22 @@
 """ChronoNation Economy Database - 1 day = 1 year simulation."""
 
+import atexit
+import bisect
+import contextlib
+import functools
+import itertools
 import sqlite3
 import json
-from datetime import datetime
+import random
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-from .engine import get_connection as get_db_connection, get_db_path
+from .engine import get_connection as get_db_connection, get_db_path, using_postgres
 
 DB_PATH = get_db_path("economy.db")
 
@@ -19,6 +27,12 @@ class ClassTier(Enum):
     ELITE = "elite"
 
 
+# Tiers in balance order; a balance is placed by bisecting the ascending
+# (middle, elite) lower bounds, so index 0/1/2 picks the tier
+_CLASS_TIER_NAMES = ("working", "middle", "elite")
+_DEFAULT_CLASS_BOUNDS = (10000, 100000)
+
+
 class PropertyMode(Enum):
     CAPITALIST = "capitalist"
     SOCIALIZED = "socialized"
@@ -49,11 +63,7 @@ class Citizen:
     @property
     def class_tier(self) -> ClassTier:
         # Default thresholds, can be overridden per-guild
-        if self.balance >= 100000:
-            return ClassTier.ELITE
-        elif self.balance >= 10000:
-            return ClassTier.MIDDLE
-        return ClassTier.WORKING
+        return ClassTier(_CLASS_TIER_NAMES[bisect.bisect_right(_DEFAULT_CLASS_BOUNDS, self.balance)])
 
 
 @dataclass
@@ -151,16 +161,132 @@ class HistoryEvent:
     created_at: Optional[datetime] = None
 
 
-def get_connection():
-    conn = get_db_connection("economy.db")
+# One connection per thread, opened on first use and kept for the life of
+# the process; helpers commit or roll back but never close it
+_tls = threading.local()
+_conns: List[Any] = []
+
+# Bump when init_db gains tables, indexes or migrations; stored in
+# PRAGMA user_version so up-to-date databases skip init_db entirely
+SCHEMA_VERSION = 2
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _init_conn():
+    # Room for every distinct statement in this module, including the
+    # UPDATE variants built by _update_sql
+    conn = get_db_connection("economy.db", cached_statements=256)
     try:
         conn.execute("PRAGMA foreign_keys = ON")
     except Exception:
         # Postgres or drivers that do not support PRAGMA
         pass
+    if not using_postgres():
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            """
+        )
+    _conns.append(conn)
+    _tls.conn = conn
+    ensure_schema()
     return conn
 
 
+def _close_conn(conn) -> None:
+    # Let SQLite refresh planner statistics for the queries it has seen
+    if not using_postgres():
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+    conn.close()
+
+
+def get_connection():
+    return getattr(_tls, "conn", None) or _init_conn()
+
+
+def _rolls_back(func):
+    """Roll back the thread's connection when a write helper raises.
+
+    Connections are kept for the life of the thread, so a failed statement
+    would otherwise leave its transaction open, holding the write lock.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            conn = getattr(_tls, "conn", None)
+            if conn is not None:
+                conn.rollback()
+            raise
+    return wrapper
+
+
+def ensure_schema() -> None:
+    """Create or migrate the economy tables unless this database is current.
+
+    Runs on the first connection of the process; safe to call again.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        # This thread's connection is already cached, so init_db's own
+        # get_connection() calls don't come back here
+        conn = get_connection()
+        if using_postgres():
+            init_db()
+        elif conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            init_db()
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        _schema_ready = True
+
+
+@atexit.register
+def _shutdown() -> None:
+    for conn in _conns:
+        _close_conn(conn)
+
+
+def _dict_rows(c) -> List[Dict]:
+    """Fetch the rest of a cursor's rows as dicts.
+
+    Zipping with the column names once per query is cheaper than dict(row),
+    which looks the names up again for every row.
+    """
+    cols = [d[0] for d in c.description]
+    return [dict(zip(cols, r)) for r in c]
+
+
+@functools.lru_cache(maxsize=64)
+def _update_sql(table: str, columns: Tuple[str, ...], where: str) -> str:
+    """UPDATE text for a set of columns, built once per combination.
+
+    Identical text lets sqlite reuse the prepared statement from its cache.
+    """
+    sets = ", ".join(f"{k} = ?" for k in columns)
+    return f"UPDATE {table} SET {sets} WHERE {where}"
+
+
+def maintenance_tick() -> None:
+    """Refresh planner statistics and truncate the WAL; run periodically."""
+    if using_postgres():
+        return
+    conn = get_connection()
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+@_rolls_back
 def init_db():
     """Initialize all economy tables."""
     conn = get_connection()
@@ -289,6 +415,25 @@ def init_db():
         )
     """)
 
+    # One row per vote; the primary key stops a user voting twice
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS bill_votes (
+            bill_id INTEGER,
+            user_id INTEGER,
+            vote_for INTEGER,
+            PRIMARY KEY (bill_id, user_id)
+        )
+    """)
+
+    # Bills from before bill_votes kept voter ids in a JSON array without
+    # the direction; move them over so they still can't vote again
+    c.execute("""
+        INSERT OR IGNORE INTO bill_votes (bill_id, user_id, vote_for)
+        SELECT bills.id, json_each.value, NULL FROM bills, json_each(bills.voters)
+        WHERE bills.voters != '[]'
+    """)
+    c.execute("UPDATE bills SET voters = '[]' WHERE voters != '[]'")
+
     # Government offices
     c.execute("""
         CREATE TABLE IF NOT EXISTS offices (
@@ -318,6 +463,18 @@ def init_db():
         )
     """)
 
+    # Party membership counts follow citizens.party_id, so joining, leaving
+    # (party_id = NULL) and switching parties are each a single UPDATE
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_party_membership
+        AFTER UPDATE OF party_id ON citizens
+        WHEN OLD.party_id IS NOT NEW.party_id
+        BEGIN
+            UPDATE parties SET member_count = member_count + 1 WHERE id = NEW.party_id;
+            UPDATE parties SET member_count = member_count - 1 WHERE id = OLD.party_id;
+        END
+    """)
+
     # Elections
     c.execute("""
         CREATE TABLE IF NOT EXISTS elections (
@@ -357,14 +514,27 @@ def init_db():
         )
     """)
 
+    # Indexes for the WHERE clauses above; policies, offices and parties
+    # are already covered by their (guild_id, ...) primary/unique keys
+    c.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_citizens_guild_alive ON citizens(guild_id, is_alive);
+        CREATE INDEX IF NOT EXISTS idx_jobs_guild_active ON jobs(guild_id, is_active);
+        CREATE INDEX IF NOT EXISTS idx_properties_guild_owner ON properties(guild_id, owner_id);
+        CREATE INDEX IF NOT EXISTS idx_businesses_guild_owner ON businesses(guild_id, owner_id);
+        CREATE INDEX IF NOT EXISTS idx_bills_guild_status ON bills(guild_id, status);
+        CREATE INDEX IF NOT EXISTS idx_history_guild_year ON history(guild_id, year DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_business_employees_user ON business_employees(user_id);
+    """)
+
     conn.commit()
-    conn.close()
     
     _seed_default_data()
 
 
+@_rolls_back
 def _seed_default_data():
     """Seed default jobs and events."""
+    global _event_pool
     conn = get_connection()
     c = conn.cursor()
 
@@ -400,11 +570,21 @@ def _seed_default_data():
         )
 
     conn.commit()
-    conn.close()
+    _event_pool = None
 
 
 # ============ Nation Functions ============
 
+def _insert_nation(c, guild_id: int):
+    """Create the nation row if missing and return it."""
+    # RETURNING would skip REAL affinity on column defaults (1000 rather
+    # than 1000.0), so the row is read back with a SELECT
+    c.execute("INSERT INTO nations (guild_id) VALUES (?) ON CONFLICT(guild_id) DO NOTHING", (guild_id,))
+    c.execute("SELECT * FROM nations WHERE guild_id = ?", (guild_id,))
+    return c.fetchone()
+
+
+@_rolls_back
 def get_or_create_nation(guild_id: int) -> Dict:
     """Get or create nation for a guild."""
     conn = get_connection()
@@ -414,28 +594,33 @@ def get_or_create_nation(guild_id: int) -> Dict:
     row = c.fetchone()
     
     if not row:
-        c.execute("INSERT INTO nations (guild_id) VALUES (?)", (guild_id,))
+        row = _insert_nation(c, guild_id)
         conn.commit()
-        c.execute("SELECT * FROM nations WHERE guild_id = ?", (guild_id,))
-        row = c.fetchone()
     
-    conn.close()
     return dict(row)
 
 
+def _invalidate_govcache(guild_id: int, kind: str) -> None:
+    """Drop the government read cache's copy of what a write just changed."""
+    # Imported here because utils.govcache imports this module
+    from utils.govcache import invalidate
+    invalidate(guild_id, kind)
+
+
+@_rolls_back
 def update_nation(guild_id: int, **kwargs) -> None:
     """Update nation fields."""
     conn = get_connection()
     c = conn.cursor()
     
-    sets = ", ".join(f"{k} = ?" for k in kwargs.keys())
     values = list(kwargs.values()) + [guild_id]
     
-    c.execute(f"UPDATE nations SET {sets} WHERE guild_id = ?", values)
+    c.execute(_update_sql("nations", tuple(kwargs), "guild_id = ?"), values)
     conn.commit()
-    conn.close()
+    _invalidate_govcache(guild_id, "nation")
 
 
+@_rolls_back
 def increment_year(guild_id: int) -> int:
     """Increment nation year and return new year."""
     conn = get_connection()
@@ -449,12 +634,13 @@ def increment_year(guild_id: int) -> int:
     year = c.fetchone()[0]
     
     conn.commit()
-    conn.close()
+    _invalidate_govcache(guild_id, "nation")
     return year
 
 
 # ============ Citizen Functions ============
 
+@_rolls_back
 def get_or_create_citizen(guild_id: int, user_id: int) -> Dict:
     """Get or create citizen record."""
     conn = get_connection()
@@ -464,29 +650,28 @@ def get_or_create_citizen(guild_id: int, user_id: int) -> Dict:
     row = c.fetchone()
     
     if not row:
+        # DO NOTHING keeps a citizen created by another writer in between
         c.execute(
-            "INSERT INTO citizens (guild_id, user_id) VALUES (?, ?)",
+            "INSERT INTO citizens (guild_id, user_id) VALUES (?, ?) ON CONFLICT(user_id, guild_id) DO NOTHING",
             (guild_id, user_id)
         )
-        conn.commit()
         c.execute("SELECT * FROM citizens WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
         row = c.fetchone()
+        conn.commit()
     
-    conn.close()
     return dict(row)
 
 
+@_rolls_back
 def update_citizen(guild_id: int, user_id: int, **kwargs) -> None:
     """Update citizen fields."""
     conn = get_connection()
     c = conn.cursor()
     
-    sets = ", ".join(f"{k} = ?" for k in kwargs.keys())
     values = list(kwargs.values()) + [guild_id, user_id]
     
-    c.execute(f"UPDATE citizens SET {sets} WHERE guild_id = ? AND user_id = ?", values)
+    c.execute(_update_sql("citizens", tuple(kwargs), "guild_id = ? AND user_id = ?"), values)
     conn.commit()
-    conn.close()
 
 
 def get_all_citizens(guild_id: int, alive_only: bool = True) -> List[Dict]:
@@ -499,21 +684,19 @@ def get_all_citizens(guild_id: int, alive_only: bool = True) -> List[Dict]:
         query += " AND is_alive = 1"
     
     c.execute(query, (guild_id,))
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
+
+
+def _class_bounds(thresholds: Optional[Dict]) -> Tuple[float, float]:
+    if thresholds is None:
+        return _DEFAULT_CLASS_BOUNDS
+    middle, elite = _DEFAULT_CLASS_BOUNDS
+    return (thresholds.get("middle", middle), thresholds.get("elite", elite))
 
 
 def get_citizen_class(balance: float, thresholds: Dict = None) -> str:
     """Determine class tier from balance."""
-    if thresholds is None:
-        thresholds = {"elite": 100000, "middle": 10000}
-    
-    if balance >= thresholds.get("elite", 100000):
-        return "elite"
-    elif balance >= thresholds.get("middle", 10000):
-        return "middle"
-    return "working"
+    return _CLASS_TIER_NAMES[bisect.bisect_right(_class_bounds(thresholds), balance)]
 
 
 def transfer_balance(guild_id: int, from_id: int, to_id: int, amount: float) -> bool:
@@ -522,20 +705,23 @@ def transfer_balance(guild_id: int, from_id: int, to_id: int, amount: float) ->
     c = conn.cursor()
     
     try:
+        # Take the write lock up front; the debit checks the balance itself,
+        # so there is no read that a concurrent transfer could invalidate
+        c.execute("BEGIN IMMEDIATE")
         if from_id == 0:
             # From treasury
-            c.execute("SELECT treasury FROM nations WHERE guild_id = ?", (guild_id,))
-            treasury = c.fetchone()[0]
-            if treasury < amount:
-                return False
-            c.execute("UPDATE nations SET treasury = treasury - ? WHERE guild_id = ?", (amount, guild_id))
+            c.execute(
+                "UPDATE nations SET treasury = treasury - ? WHERE guild_id = ? AND treasury >= ?",
+                (amount, guild_id, amount),
+            )
         else:
-            c.execute("SELECT balance FROM citizens WHERE guild_id = ? AND user_id = ?", (guild_id, from_id))
-            row = c.fetchone()
-            if not row or row[0] < amount:
-                return False
-            c.execute("UPDATE citizens SET balance = balance - ? WHERE guild_id = ? AND user_id = ?", 
-                     (amount, guild_id, from_id))
+            c.execute(
+                "UPDATE citizens SET balance = balance - ? WHERE guild_id = ? AND user_id = ? AND balance >= ?",
+                (amount, guild_id, from_id, amount),
+            )
+        if c.rowcount == 0:
+            conn.rollback()
+            return False
         
         if to_id == 0:
             # To treasury
@@ -545,17 +731,18 @@ def transfer_balance(guild_id: int, from_id: int, to_id: int, amount: float) ->
                      (amount, guild_id, to_id))
         
         conn.commit()
+        if from_id == 0 or to_id == 0:
+            _invalidate_govcache(guild_id, "nation")
         return True
     except Exception as e:
         conn.rollback()
         print(f"Transfer failed: {e}")
         return False
-    finally:
-        conn.close()
 
 
 # ============ Job Functions ============
 
+@_rolls_back
 def create_default_jobs(guild_id: int):
     """Create default jobs for a new nation."""
     conn = get_connection()
@@ -579,7 +766,6 @@ def create_default_jobs(guild_id: int):
         )
     
     conn.commit()
-    conn.close()
 
 
 def get_jobs(guild_id: int) -> List[Dict]:
@@ -587,9 +773,7 @@ def get_jobs(guild_id: int) -> List[Dict]:
     conn = get_connection()
     c = conn.cursor()
     c.execute("SELECT * FROM jobs WHERE guild_id = ? AND is_active = 1", (guild_id,))
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
 
 
 def get_job(job_id: int) -> Optional[Dict]:
@@ -598,7 +782,6 @@ def get_job(job_id: int) -> Optional[Dict]:
     c = conn.cursor()
     c.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
     row = c.fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
@@ -628,22 +811,32 @@ DEFAULT_POLICIES = {
 }
 
 
+# Policies change only through set_policy, which drops the guild's entry;
+# the TTL bounds staleness if another process writes economy.db
+POLICY_CACHE_TTL = 60.0
+
+# guild_id -> (stored_at, merged policies)
+_policy_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cached_policies(guild_id: int) -> Dict[str, Any]:
+    entry = _policy_cache.get(guild_id)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] <= POLICY_CACHE_TTL:
+        return entry[1]
+    c = get_connection().cursor()
+    c.execute("SELECT key, value FROM policies WHERE guild_id = ?", (guild_id,))
+    policies = _merge_policies(c.fetchall())
+    _policy_cache[guild_id] = (now, policies)
+    return policies
+
+
 def get_policy(guild_id: int, key: str) -> Any:
     """Get a policy value."""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT value FROM policies WHERE guild_id = ? AND key = ?", (guild_id, key))
-    row = c.fetchone()
-    conn.close()
-    
-    if row:
-        try:
-            return json.loads(row[0])
-        except:
-            return row[0]
-    return DEFAULT_POLICIES.get(key)
+    return _cached_policies(guild_id).get(key)
 
 
+@_rolls_back
 def set_policy(guild_id: int, key: str, value: Any) -> None:
     """Set a policy value."""
     conn = get_connection()
@@ -656,17 +849,18 @@ def set_policy(guild_id: int, key: str, value: Any) -> None:
         (guild_id, key, value_str, datetime.utcnow().isoformat())
     )
     conn.commit()
-    conn.close()
+    _policy_cache.pop(guild_id, None)
+    _invalidate_govcache(guild_id, "policies")
 
 
 def get_all_policies(guild_id: int) -> Dict[str, Any]:
     """Get all policies for a guild, with defaults."""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT key, value FROM policies WHERE guild_id = ?", (guild_id,))
-    rows = c.fetchall()
-    conn.close()
-    
+    # Copied so callers can't modify the cached dict
+    return dict(_cached_policies(guild_id))
+
+
+def _merge_policies(rows) -> Dict[str, Any]:
+    """Overlay stored policy rows on top of the defaults."""
     policies = DEFAULT_POLICIES.copy()
     for key, value in rows:
         try:
@@ -678,6 +872,7 @@ def get_all_policies(guild_id: int) -> Dict[str, Any]:
 
 # ============ Property Functions ============
 
+@_rolls_back
 def create_property(guild_id: int, owner_id: int, name: str, 
                    property_type: str, value: float, rent_price: float = 0) -> int:
     """Create a new property."""
@@ -689,7 +884,6 @@ def create_property(guild_id: int, owner_id: int, name: str,
     )
     prop_id = c.lastrowid
     conn.commit()
-    conn.close()
     return prop_id
 
 
@@ -703,11 +897,10 @@ def get_properties(guild_id: int, owner_id: Optional[int] = None) -> List[Dict]:
     else:
         c.execute("SELECT * FROM properties WHERE guild_id = ?", (guild_id,))
     
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
 
 
+@_rolls_back
 def transfer_property(property_id: int, new_owner_id: int) -> None:
     """Transfer property ownership."""
     conn = get_connection()
@@ -715,11 +908,11 @@ def transfer_property(property_id: int, new_owner_id: int) -> None:
     c.execute("UPDATE properties SET owner_id = ?, tenant_id = NULL WHERE id = ?", 
              (new_owner_id, property_id))
     conn.commit()
-    conn.close()
 
 
 # ============ Business Functions ============
 
+@_rolls_back
 def create_business(guild_id: int, owner_id: int, name: str, 
                    business_type: str, capital: float, year: int) -> int:
     """Create a new business."""
@@ -731,7 +924,6 @@ def create_business(guild_id: int, owner_id: int, name: str,
     )
     biz_id = c.lastrowid
     conn.commit()
-    conn.close()
     return biz_id
 
 
@@ -745,29 +937,27 @@ def get_businesses(guild_id: int, owner_id: Optional[int] = None) -> List[Dict]:
     else:
         c.execute("SELECT * FROM businesses WHERE guild_id = ?", (guild_id,))
     
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
 
 
 # ============ Party Functions ============
 
+@_rolls_back
 def create_party(guild_id: int, name: str, leader_id: int, year: int) -> int:
     """Create a political party."""
     conn = get_connection()
     c = conn.cursor()
     c.execute(
-        "INSERT INTO parties (guild_id, name, leader_id, founded_year) VALUES (?, ?, ?, ?)",
+        "INSERT INTO parties (guild_id, name, leader_id, member_count, founded_year) VALUES (?, ?, ?, 0, ?)",
         (guild_id, name, leader_id, year)
     )
     party_id = c.lastrowid
     
-    # Update leader's party
+    # Update leader's party; trg_party_membership counts them in
     c.execute("UPDATE citizens SET party_id = ? WHERE guild_id = ? AND user_id = ?",
              (party_id, guild_id, leader_id))
     
     conn.commit()
-    conn.close()
     return party_id
 
 
@@ -776,24 +966,23 @@ def get_parties(guild_id: int) -> List[Dict]:
     conn = get_connection()
     c = conn.cursor()
     c.execute("SELECT * FROM parties WHERE guild_id = ?", (guild_id,))
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
 
 
+@_rolls_back
 def join_party(guild_id: int, user_id: int, party_id: int) -> None:
     """Join a party."""
     conn = get_connection()
     c = conn.cursor()
+    # trg_party_membership moves the member count from any old party
     c.execute("UPDATE citizens SET party_id = ? WHERE guild_id = ? AND user_id = ?",
              (party_id, guild_id, user_id))
-    c.execute("UPDATE parties SET member_count = member_count + 1 WHERE id = ?", (party_id,))
     conn.commit()
-    conn.close()
 
 
 # ============ Office Functions ============
 
+@_rolls_back
 def create_default_offices(guild_id: int, gov_type: str):
     """Create default offices based on government type."""
     conn = get_connection()
@@ -830,7 +1019,15 @@ def create_default_offices(guild_id: int, gov_type: str):
         )
     
     conn.commit()
-    conn.close()
+
+
+def _office_from_row(row) -> Dict:
+    """Convert an office row to a dict with its powers parsed once."""
+    office = dict(row)
+    powers = tuple(json.loads(office.get("powers") or "[]"))
+    office["_powers"] = powers
+    office["_powers_set"] = frozenset(powers)
+    return office
 
 
 def get_offices(guild_id: int) -> List[Dict]:
@@ -839,10 +1036,38 @@ def get_offices(guild_id: int) -> List[Dict]:
     c = conn.cursor()
     c.execute("SELECT * FROM offices WHERE guild_id = ?", (guild_id,))
     rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [_office_from_row(r) for r in rows]
+
 
+class NationSnapshot(NamedTuple):
+    nation: Dict
+    policies: Dict[str, Any]
+    offices: List[Dict]
 
+
+@_rolls_back
+def get_nation_snapshot(guild_id: int) -> NationSnapshot:
+    """Get nation, policies and offices for a guild in one transaction."""
+    conn = get_connection()
+    c = conn.cursor()
+    
+    c.execute("SELECT * FROM nations WHERE guild_id = ?", (guild_id,))
+    row = c.fetchone()
+    if not row:
+        row = _insert_nation(c, guild_id)
+    nation = dict(row)
+    
+    c.execute("SELECT key, value FROM policies WHERE guild_id = ?", (guild_id,))
+    policies = _merge_policies(c.fetchall())
+    
+    c.execute("SELECT * FROM offices WHERE guild_id = ?", (guild_id,))
+    offices = [_office_from_row(r) for r in c.fetchall()]
+    
+    conn.commit()
+    return NationSnapshot(nation, policies, offices)
+
+
+@_rolls_back
 def appoint_to_office(office_id: int, user_id: int, year: int) -> None:
     """Appoint someone to office."""
     conn = get_connection()
@@ -852,54 +1077,96 @@ def appoint_to_office(office_id: int, user_id: int, year: int) -> None:
         (user_id, year, office_id)
     )
     conn.commit()
-    conn.close()
+    row = c.execute("SELECT guild_id FROM offices WHERE id = ?", (office_id,)).fetchone()
+    if row:
+        _invalidate_govcache(row[0], "offices")
 
 
 # ============ Bill Functions ============
 
+def _bill_ends_at(value) -> int:
+    """Voting deadline as a Unix epoch; older rows stored naive UTC ISO strings."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _bill_from_row(row) -> Dict:
+    bill = dict(row)
+    bill["voting_ends_at"] = _bill_ends_at(bill["voting_ends_at"])
+    return bill
+
+
+@_rolls_back
 def create_bill(guild_id: int, proposer_id: int, policy_key: str, 
                new_value: str, description: str, voting_hours: int = 24) -> int:
     """Create a new bill for voting."""
     conn = get_connection()
     c = conn.cursor()
     
-    from datetime import timedelta
-    ends_at = datetime.utcnow() + timedelta(hours=voting_hours)
+    ends_at = int(time.time()) + voting_hours * 3600
     
     c.execute(
         "INSERT INTO bills (guild_id, proposer_id, policy_key, new_value, description, voting_ends_at) VALUES (?, ?, ?, ?, ?, ?)",
-        (guild_id, proposer_id, policy_key, new_value, description, ends_at.isoformat())
+        (guild_id, proposer_id, policy_key, new_value, description, ends_at)
     )
     bill_id = c.lastrowid
     conn.commit()
-    conn.close()
     return bill_id
 
 
-def vote_on_bill(bill_id: int, user_id: int, vote_for: bool) -> bool:
-    """Cast a vote on a bill."""
+def vote_on_bill(bill_id: int, user_id: int, vote_for: bool) -> Tuple[bool, str]:
+    """Cast a vote on a bill, checking voter eligibility in the same transaction.
+
+    Returns (success, reason) where reason is one of ``ok``, ``missing_bill``,
+    ``already_voted`` or ``ineligible``.
+    """
     conn = get_connection()
     c = conn.cursor()
     
-    c.execute("SELECT voters, status FROM bills WHERE id = ?", (bill_id,))
-    row = c.fetchone()
-    if not row or row[1] != "pending":
-        conn.close()
-        return False
-    
-    voters = json.loads(row[0])
-    if user_id in voters:
-        conn.close()
-        return False  # Already voted
-    
-    voters.append(user_id)
-    field = "votes_for" if vote_for else "votes_against"
-    
-    c.execute(f"UPDATE bills SET {field} = {field} + 1, voters = ? WHERE id = ?",
-             (json.dumps(voters), bill_id))
-    conn.commit()
-    conn.close()
-    return True
+    try:
+        # Take the write lock before the checks, so the bill's status and the
+        # voter's balance can't change between them and the vote
+        c.execute("BEGIN IMMEDIATE")
+        c.execute("SELECT guild_id, status FROM bills WHERE id = ?", (bill_id,))
+        row = c.fetchone()
+        if not row or row[1] != "pending":
+            conn.rollback()
+            return False, "missing_bill"
+        guild_id = row[0]
+        
+        c.execute(
+            "SELECT key, value FROM policies WHERE guild_id = ? AND key IN (?, ?)",
+            (guild_id, "voting_eligibility", "elite_class_threshold"),
+        )
+        policies = _merge_policies(c.fetchall())
+        if policies["voting_eligibility"] == "elites_only":
+            c.execute(
+                "SELECT balance FROM citizens WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id),
+            )
+            citizen = c.fetchone()
+            balance = citizen[0] if citizen else Citizen.balance
+            if balance < policies["elite_class_threshold"]:
+                conn.rollback()
+                return False, "ineligible"
+        
+        c.execute(
+            "INSERT OR IGNORE INTO bill_votes (bill_id, user_id, vote_for) VALUES (?, ?, ?)",
+            (bill_id, user_id, int(vote_for)),
+        )
+        if c.rowcount == 0:
+            conn.rollback()
+            return False, "already_voted"
+        
+        field = "votes_for" if vote_for else "votes_against"
+        c.execute(f"UPDATE bills SET {field} = {field} + 1 WHERE id = ?", (bill_id,))
+        conn.commit()
+        return True, "ok"
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def get_pending_bills(guild_id: int) -> List[Dict]:
@@ -908,17 +1175,17 @@ def get_pending_bills(guild_id: int) -> List[Dict]:
     c = conn.cursor()
     c.execute("SELECT * FROM bills WHERE guild_id = ? AND status = 'pending'", (guild_id,))
     rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [_bill_from_row(r) for r in rows]
 
 
+@_rolls_back
 def resolve_bill(bill_id: int) -> Dict:
     """Resolve a bill's vote."""
     conn = get_connection()
     c = conn.cursor()
     
     c.execute("SELECT * FROM bills WHERE id = ?", (bill_id,))
-    bill = dict(c.fetchone())
+    bill = _bill_from_row(c.fetchone())
     
     passed = bill["votes_for"] > bill["votes_against"]
     status = "passed" if passed else "failed"
@@ -929,7 +1196,6 @@ def resolve_bill(bill_id: int) -> Dict:
         set_policy(bill["guild_id"], bill["policy_key"], bill["new_value"])
     
     conn.commit()
-    conn.close()
     
     bill["status"] = status
     return bill
@@ -937,19 +1203,57 @@ def resolve_bill(bill_id: int) -> Dict:
 
 # ============ History Functions ============
 
+_INSERT_HISTORY_SQL = (
+    "INSERT INTO history (guild_id, year, event_type, description, data) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+@_rolls_back
 def log_history(guild_id: int, year: int, event_type: str, 
-               description: str, data: Dict = None) -> int:
-    """Log an event to history."""
+               description: str, data: Dict = None) -> None:
+    """Log an event to history.
+
+    Inside batched_history() the row is queued; otherwise it is written at once.
+    """
+    row = (guild_id, year, event_type, description, json.dumps(data or {}))
+    pending = getattr(_tls, "history", None)
+    if pending is not None:
+        pending.append(row)
+        return
+    
     conn = get_connection()
-    c = conn.cursor()
-    c.execute(
-        "INSERT INTO history (guild_id, year, event_type, description, data) VALUES (?, ?, ?, ?, ?)",
-        (guild_id, year, event_type, description, json.dumps(data or {}))
-    )
-    event_id = c.lastrowid
+    conn.execute(_INSERT_HISTORY_SQL, row)
+    conn.commit()
+
+
+@contextlib.contextmanager
+def batched_history():
+    """Collect this thread's log_history rows and write them in one transaction.
+
+    Used by the year tick, which logs a burst of events; the rows are
+    written when the block exits normally. If it raises, they are dropped
+    so the block's own exception is what propagates.
+    """
+    if getattr(_tls, "history", None) is not None:
+        # Already batching further up the stack
+        yield
+        return
+    _tls.history = []
+    try:
+        yield
+        rows = _tls.history
+    finally:
+        _tls.history = None
+    if rows:
+        _write_history(rows)
+
+
+@_rolls_back
+def _write_history(rows: List[Tuple]) -> None:
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(_INSERT_HISTORY_SQL, rows)
     conn.commit()
-    conn.close()
-    return event_id
 
 
 def get_history(guild_id: int, limit: int = 20) -> List[Dict]:
@@ -960,26 +1264,25 @@ def get_history(guild_id: int, limit: int = 20) -> List[Dict]:
         "SELECT * FROM history WHERE guild_id = ? ORDER BY year DESC, id DESC LIMIT ?",
         (guild_id, limit)
     )
-    rows = c.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return _dict_rows(c)
+
+
+# (events, cumulative weights); event_pool is only written by
+# _seed_default_data, which drops this
+_event_pool: Optional[Tuple[List[Dict], List[int]]] = None
 
 
 def get_random_event() -> Optional[Dict]:
     """Get a weighted random event from the pool."""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT * FROM event_pool")
-    events = [dict(r) for r in c.fetchall()]
-    conn.close()
+    global _event_pool
+    if _event_pool is None:
+        c = get_connection().cursor()
+        c.execute("SELECT * FROM event_pool")
+        events = _dict_rows(c)
+        _event_pool = (events, list(itertools.accumulate(e["weight"] for e in events)))
     
+    events, cum_weights = _event_pool
     if not events:
         return None
     
-    import random
-    weights = [e["weight"] for e in events]
-    return random.choices(events, weights=weights, k=1)[0]
-
-
-# Initialize on import
-init_db()
+    return dict(random.choices(events, cum_weights=cum_weights, k=1)[0])
@@ -38,8 +38,11 @@ def using_postgres() -> bool:
     return is_postgres_url(DATABASE_URL)
 
 
-def get_connection(db_name: str):
-    """Return a DB connection, choosing Postgres when DATABASE_URL is set."""
+def get_connection(db_name: str, *, cached_statements: int = 128):
+    """Return a DB connection, choosing Postgres when DATABASE_URL is set.
+
+    `cached_statements` sizes sqlite's per-connection prepared statement cache.
+    """
     if using_postgres():
         if not ALLOW_EXPERIMENTAL_POSTGRES:
             raise RuntimeError(
@@ -51,6 +54,6 @@ def get_connection(db_name: str):
         return psycopg.connect(DATABASE_URL, row_factory=dict_row)
 
     db_path = get_db_path(db_name)
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=cached_statements)
     conn.row_factory = sqlite3.Row
     return conn
@@ -2,12 +2,27 @@
 """Israel GPT Discord chatbot entry point."""
 
 import asyncio
+import atexit
+import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 
 from config import TOKEN
 from core import bot, setup_events
 
 
+def setup_logging() -> None:
+    """Route log records through a queue so stream writes happen off the event loop."""
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(records, handler)
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(records)])
+    listener.start()
+    atexit.register(listener.stop)
+
+
 async def main() -> None:
     """Initialize and run the chatbot."""
     if not TOKEN:
@@ -21,4 +36,5 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    setup_logging()
     asyncio.run(main())
@@ -6,6 +6,7 @@ Exports a small HTTP server on METRICS_PORT to be scraped by Prometheus.
 
 from __future__ import annotations
 
+import functools
 import threading
 from typing import Optional
 
@@ -71,8 +72,25 @@ def start_metrics_server(port: int = 8000) -> None:
         _server_started = True
 
 
+# Resolving a labelled child hashes the label values and takes the
+# metric's lock, so the per-event counters keep their children cached
+@functools.cache
+def _message_counter(guild_id: Optional[int]):
+    return MESSAGE_COUNTER.labels(guild_id=str(guild_id or "unknown"))
+
+
+@functools.cache
+def _error_counter(source: str):
+    return ERROR_COUNTER.labels(source=source or "unknown")
+
+
+@functools.cache
+def _spam_counter(guild_id: Optional[int]):
+    return SPAM_COUNTER.labels(guild_id=str(guild_id or "unknown"))
+
+
 def count_message(guild_id: Optional[int]) -> None:
-    MESSAGE_COUNTER.labels(guild_id=str(guild_id or "unknown")).inc()
+    _message_counter(guild_id).inc()
 
 
 def count_command(guild_id: Optional[int], command_name: str) -> None:
@@ -83,11 +101,11 @@ def count_command(guild_id: Optional[int], command_name: str) -> None:
 
 
 def count_error(source: str) -> None:
-    ERROR_COUNTER.labels(source=source or "unknown").inc()
+    _error_counter(source).inc()
 
 
 def count_spam(guild_id: Optional[int]) -> None:
-    SPAM_COUNTER.labels(guild_id=str(guild_id or "unknown")).inc()
+    _spam_counter(guild_id).inc()
 
 
 def count_llm_request(model: str, status: str) -> None:
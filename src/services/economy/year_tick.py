@@ -1,8 +1,9 @@
 """Year Tick System - Runs daily (1 real day = 1 game year)."""
 
+import asyncio
 import random
+import time
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
 
 from db.economy import (
     get_or_create_nation,
@@ -22,6 +23,7 @@ from db.economy import (
     get_pending_bills,
     resolve_bill,
     log_history,
+    batched_history,
     get_random_event,
 )
 from economy_service.rust_adapter import EconomyMath
@@ -49,49 +51,61 @@ class YearTickResult:
 async def process_year_tick(guild_id: int) -> YearTickResult:
     """
     Process the annual tick for a nation.
+    The tick does blocking DB work, so it runs in a worker thread to keep
+    the event loop responsive.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _run_year_tick, guild_id)
+
+
+def _run_year_tick(guild_id: int) -> YearTickResult:
+    """
+    Synchronous body of the annual tick.
     This is the core simulation loop.
     """
-    # Get nation and increment year
-    nation = get_or_create_nation(guild_id)
-    new_year = increment_year(guild_id)
-    
-    result = YearTickResult(guild_id, new_year)
-    policies = get_all_policies(guild_id)
-    math = EconomyMath(policies)
-    
-    # Get all living citizens
-    citizens = get_all_citizens(guild_id, alive_only=True)
-    
-    # 1. Aging and death
-    _process_aging(guild_id, citizens, policies, result)
-    
-    # 2. Income (jobs and businesses)
-    _process_income(guild_id, citizens, policies, nation, result, math)
-    
-    # 3. Rent collection
-    _process_rent(guild_id, policies, result)
-    
-    # 4. Tax collection
-    _process_taxes(guild_id, citizens, policies, nation, result, math)
-    
-    # 5. UBI / Welfare
-    _process_welfare(guild_id, citizens, policies, nation, result)
-    
-    # 6. Government cycle (terms, elections)
-    _process_government_cycle(guild_id, new_year, policies, result)
-    
-    # 7. Resolve pending bills
-    _process_bills(guild_id, result)
-    
-    # 8. Random events
-    _process_random_events(guild_id, new_year, policies, result)
-    
-    # Log year summary to history
-    summary = _generate_year_summary(result)
-    log_history(guild_id, new_year, "year_summary", summary)
-    result.history_entries.append(summary)
-    
-    return result
+    # The tick logs many history events; write them in one transaction
+    with batched_history():
+        # Get nation and increment year
+        nation = get_or_create_nation(guild_id)
+        new_year = increment_year(guild_id)
+        
+        result = YearTickResult(guild_id, new_year)
+        policies = get_all_policies(guild_id)
+        math = EconomyMath(policies)
+        
+        # Get all living citizens
+        citizens = get_all_citizens(guild_id, alive_only=True)
+        
+        # 1. Aging and death
+        _process_aging(guild_id, citizens, policies, result)
+        
+        # 2. Income (jobs and businesses)
+        _process_income(guild_id, citizens, policies, nation, result, math)
+        
+        # 3. Rent collection
+        _process_rent(guild_id, policies, result)
+        
+        # 4. Tax collection
+        _process_taxes(guild_id, citizens, policies, nation, result, math)
+        
+        # 5. UBI / Welfare
+        _process_welfare(guild_id, citizens, policies, nation, result)
+        
+        # 6. Government cycle (terms, elections)
+        _process_government_cycle(guild_id, new_year, policies, result)
+        
+        # 7. Resolve pending bills
+        _process_bills(guild_id, result)
+        
+        # 8. Random events
+        _process_random_events(guild_id, new_year, policies, result)
+        
+        # Log year summary to history
+        summary = _generate_year_summary(result)
+        log_history(guild_id, new_year, "year_summary", summary)
+        result.history_entries.append(summary)
+        
+        return result
 
 
 def _process_aging(guild_id: int, citizens: List[Dict], 
@@ -301,11 +315,10 @@ def _process_government_cycle(guild_id: int, year: int,
 def _process_bills(guild_id: int, result: YearTickResult):
     """Resolve bills whose voting period has ended."""
     bills = get_pending_bills(guild_id)
-    now = datetime.utcnow()
+    now_ts = int(time.time())
     
     for bill in bills:
-        ends_at = datetime.fromisoformat(bill["voting_ends_at"])
-        if now >= ends_at:
+        if now_ts >= bill["voting_ends_at"]:
             resolved = resolve_bill(bill["id"])
             result.bills_resolved.append(resolved)
             
@@ -388,31 +401,35 @@ def socialize_property(guild_id: int, compensate: bool = True) -> int:
     conn = get_connection()
     c = conn.cursor()
     
-    # Get all private properties
-    c.execute("SELECT * FROM properties WHERE guild_id = ? AND owner_id != 0", (guild_id,))
-    properties = c.fetchall()
+    try:
+        # Get all private properties
+        c.execute("SELECT * FROM properties WHERE guild_id = ? AND owner_id != 0", (guild_id,))
+        properties = c.fetchall()
     
-    count = 0
-    for prop in properties:
-        prop = dict(prop)
-        former_owner = prop["owner_id"]
-        value = prop["value"]
-        
-        # Transfer to state (owner_id = 0)
-        c.execute("UPDATE properties SET owner_id = 0, tenant_id = NULL WHERE id = ?", 
-                 (prop["id"],))
-        
-        # Compensate former owner (optional)
-        if compensate and former_owner:
-            compensation = value * 0.5  # 50% compensation
-            c.execute(
-                "UPDATE citizens SET balance = balance + ? WHERE guild_id = ? AND user_id = ?",
-                (compensation, guild_id, former_owner)
-            )
+        count = 0
+        for prop in properties:
+            prop = dict(prop)
+            former_owner = prop["owner_id"]
+            value = prop["value"]
+        
+            # Transfer to state (owner_id = 0)
+            c.execute("UPDATE properties SET owner_id = 0, tenant_id = NULL WHERE id = ?", 
+                     (prop["id"],))
+        
+            # Compensate former owner (optional)
+            if compensate and former_owner:
+                compensation = value * 0.5  # 50% compensation
+                c.execute(
+                    "UPDATE citizens SET balance = balance + ? WHERE guild_id = ? AND user_id = ?",
+                    (compensation, guild_id, former_owner)
+                )
         
-        count += 1
+            count += 1
     
-    conn.commit()
-    conn.close()
+        conn.commit()
+    except Exception:
+        # The connection is reused, so don't leave the transaction open
+        conn.rollback()
+        raise
     
     return count
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import re
+import time
 from typing import Dict, List, Optional, Tuple
 
 import discord
@@ -15,6 +16,13 @@ from .client import get_client
 
 _URL_PATTERN = re.compile(r"https?://\S+")
 
+# Channel history is reused for a few seconds so back-to-back replies in a
+# busy channel share one fetch
+CONTEXT_CACHE_TTL = 3.0
+CONTEXT_CACHE_MAX = 512
+# channel_id -> (fetched_at, limit, messages)
+_context_cache: Dict[int, Tuple[float, int, List[Tuple[str, str, str]]]] = {}
+
 
 def _truncate_links(text: str, max_len: int = 30) -> str:
     """Replace long URLs with compact placeholders for channel context."""
@@ -53,6 +61,12 @@ async def fetch_channel_context(
     limit: int = 20,
 ) -> List[Tuple[str, str, str]]:
     """Fetch recent non-bot channel messages for lightweight conversation context."""
+    channel_id = getattr(channel, "id", None)
+    now = time.monotonic()
+    cached = _context_cache.get(channel_id) if channel_id is not None else None
+    if cached and now - cached[0] < CONTEXT_CACHE_TTL and cached[1] >= limit:
+        return cached[2] if cached[1] == limit else cached[2][-limit:]
+
     messages: list[Tuple[str, str, str]] = []
     try:
         async for msg in channel.history(limit=limit):
@@ -67,8 +81,15 @@ async def fetch_channel_context(
                 ))
     except Exception as e:
         print(f"Failed to fetch channel history: {e}")
-
-    return list(reversed(messages))
+        return list(reversed(messages))
+
+    messages.reverse()
+    if channel_id is not None:
+        if len(_context_cache) >= CONTEXT_CACHE_MAX:
+            for key in [k for k, v in _context_cache.items() if now - v[0] >= CONTEXT_CACHE_TTL]:
+                del _context_cache[key]
+        _context_cache[channel_id] = (now, limit, messages)
+    return messages
 
 
 async def generate_chatbot_reply(
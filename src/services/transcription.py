@@ -123,7 +123,13 @@ class VoiceRecordingSession:
             end_voice_session(self.session_id, self.transcription_count)
         self.is_active = False
 
-    async def process_audio(self, audio_data: bytes, user_id: int, username: str) -> Optional[str]:
+    async def process_audio(
+        self,
+        audio_data: bytes,
+        user_id: int,
+        username: str,
+        duration_secs: Optional[float] = None,
+    ) -> Optional[str]:
         """
         Process audio from a user: transcribe and save.
         Returns the transcribed text or None.
@@ -143,7 +149,10 @@ class VoiceRecordingSession:
             user_id=user_id,
             content=text,
             username=username,
-            duration_secs=len(audio_data) / 48000,  # Rough estimate
+            duration_secs=(
+                duration_secs if duration_secs is not None
+                else len(audio_data) / 48000  # Rough estimate
+            ),
         )
 
         self.transcription_count += 1
@@ -1,5 +1,5 @@
 """Utility functions for Guildest."""
 
-from .helpers import truncate, parse_duration, text_contains_phrase
+from .helpers import truncate, parse_duration, text_contains_phrase, chunks
 
-__all__ = ["truncate", "parse_duration", "text_contains_phrase"]
+__all__ = ["truncate", "parse_duration", "text_contains_phrase", "chunks"]
@@ -0,0 +1,122 @@
+"""Short-lived per-guild cache for government reads.
+
+Nations, policies and offices are read by nearly every government command
+but change rarely, so they are kept in memory for a few seconds and
+invalidated by the db.economy writers that change them. Every function
+returns a copy, so callers can't modify the cached values.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from db.economy import (
+    NationSnapshot,
+    get_all_policies,
+    get_nation_snapshot,
+    get_offices,
+    get_or_create_nation,
+)
+
+CACHE_TTL = 30.0
+CACHE_MAXSIZE = 1024
+
+KINDS = ("nation", "policies", "offices")
+# Entries built from another kind and dropped along with it
+DERIVED = {"offices": ("holder_powers", "offices_by_name")}
+
+# (kind, guild_id) -> (stored_at, value)
+_cache: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+
+
+def _get(kind: str, guild_id: int) -> Optional[Any]:
+    entry = _cache.get((kind, guild_id))
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at > CACHE_TTL:
+        _cache.pop((kind, guild_id), None)
+        return None
+    return value
+
+
+def _put(kind: str, guild_id: int, value: Any) -> Any:
+    if len(_cache) >= CACHE_MAXSIZE:
+        # Drop the oldest entry; dicts keep insertion order
+        _cache.pop(next(iter(_cache)), None)
+    for derived in DERIVED.get(kind, ()):
+        _cache.pop((derived, guild_id), None)
+    _cache[(kind, guild_id)] = (time.monotonic(), value)
+    return value
+
+
+def cached_nation(guild_id: int) -> Dict:
+    """Cached `get_or_create_nation`."""
+    nation = _get("nation", guild_id)
+    if nation is None:
+        nation = _put("nation", guild_id, get_or_create_nation(guild_id))
+    return dict(nation)
+
+
+def cached_policies(guild_id: int) -> Dict[str, Any]:
+    """Cached `get_all_policies`."""
+    policies = _get("policies", guild_id)
+    if policies is None:
+        policies = _put("policies", guild_id, get_all_policies(guild_id))
+    return dict(policies)
+
+
+def _get_offices(guild_id: int) -> List[Dict]:
+    offices = _get("offices", guild_id)
+    if offices is None:
+        offices = _put("offices", guild_id, get_offices(guild_id))
+    return offices
+
+
+def cached_offices(guild_id: int) -> List[Dict]:
+    """Cached `get_offices`."""
+    return [dict(o) for o in _get_offices(guild_id)]
+
+
+def cached_holder_powers(guild_id: int) -> Dict[int, FrozenSet[str]]:
+    """Map of office holder id to the union of their offices' powers."""
+    index = _get("holder_powers", guild_id)
+    if index is None:
+        index = {}
+        for office in _get_offices(guild_id):
+            holder_id = office.get("holder_id")
+            if holder_id:
+                index[holder_id] = index.get(holder_id, frozenset()) | office["_powers_set"]
+        _put("holder_powers", guild_id, index)
+    return dict(index)
+
+
+def cached_offices_by_name(guild_id: int) -> Dict[str, Dict]:
+    """Map of lowercased office name to office."""
+    index = _get("offices_by_name", guild_id)
+    if index is None:
+        index = {o["name"].lower(): o for o in _get_offices(guild_id)}
+        _put("offices_by_name", guild_id, index)
+    return {name: dict(o) for name, o in index.items()}
+
+
+def cached_snapshot(guild_id: int) -> NationSnapshot:
+    """Cached `get_nation_snapshot`, refilling all three kinds on a miss."""
+    nation = _get("nation", guild_id)
+    policies = _get("policies", guild_id)
+    offices = _get("offices", guild_id)
+    if nation is None or policies is None or offices is None:
+        nation, policies, offices = get_nation_snapshot(guild_id)
+        _put("nation", guild_id, nation)
+        _put("policies", guild_id, policies)
+        _put("offices", guild_id, offices)
+    return NationSnapshot(dict(nation), dict(policies), [dict(o) for o in offices])
+
+
+def invalidate(guild_id: int, kind: Optional[str] = None) -> None:
+    """Drop cached entries for a guild, either one kind or all of them."""
+    for k in (kind,) if kind else KINDS:
+        _cache.pop((k, guild_id), None)
+        for derived in DERIVED.get(k, ()):
+            _cache.pop((derived, guild_id), None)
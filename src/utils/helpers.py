@@ -8,7 +8,9 @@ from __future__ import annotations
 
 import re
 from datetime import timedelta
-from typing import Optional
+from typing import Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
 
 # Try to import Rust-accelerated versions
 try:
@@ -61,3 +63,9 @@ def text_contains_phrase(text: str | None, phrase: str) -> bool:
     if _USE_RUST and text is not None:
         return _rust_text_contains_phrase(text, phrase)
     return text is not None and phrase in text.lower()
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]